@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+from Common import CommonMethods
+from regex_handler import RegexHandler
+
+#############
+# CONSTANTS #
+#############
+
+
+class ClassNamesScanner(object):
+    """
+    This class finds which of the project classes are mentioned in the java files,
+    each file is split once into its identifiers and they are looked up in the classes names set,
+    so only whole identifiers are matched ("Contact" is not found in "ContactViewBinder"),
+    it also keeps an inverted index of the scanned files that mention each class
+    """
+    def __init__(self, classes, files_headers=None):
+        """
+        Constructor
+        :param classes: List of the project classes names
+        :param files_headers: dictionary of the already read files headers (check GetManiAndJava.get_files_headers)
+        """
+        self.classes = frozenset(classes)
+        self.files_headers = files_headers if files_headers is not None else dict()
+        self.files_classes = dict()
+        self.classes_files = dict()
+
+    def find_classes(self, text):
+        """
+        This method finds the classes mentioned in the given text
+        :param text: String to search in
+        :return: set of classes names
+        """
+        if not text:
+            return set()
+        return self.classes.intersection(RegexHandler().apply_identifier_regex(string=text))
+
+    def scan_file(self, java_file, content=None):
+        """
+        This method finds the classes mentioned in the given java file, each file is scanned only once
+        :param java_file: Java file path
+        :param content: The file content (it is read if not given)
+        :return: set of classes names
+        """
+        if java_file not in self.files_classes:
+            if content is None:
+                content = CommonMethods.read_file(java_file, header=self.files_headers.get(java_file))
+            classes_in_file = self.find_classes(content)
+            self.files_classes[java_file] = classes_in_file
+            for class_name in classes_in_file:
+                self.classes_files.setdefault(class_name, list()).append(java_file)
+        return self.files_classes[java_file]
+
+    def scan_files(self, java_files):
+        """
+        This method scans all the given java files (the already scanned files are skipped)
+        :param java_files: List of java files
+        :return: nothing
+        """
+        for java_file in java_files:
+            self.scan_file(java_file)
+
+    def get_files_mentioning(self, class_name):
+        """
+        Query the inverted index for the scanned files that mention the given class
+        :param class_name: class name
+        :return: List of java files, in the order they were scanned
+        """
+        return self.classes_files.get(class_name, list())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+
+#################
+# Local Imports #
+#################
+
+from ClassNamesScanner import ClassNamesScanner
+
+#############
+# CONSTANTS #
+#############
+
+
+class ClassReferenceGraph(object):
+    """
+    This class holds which project classes are mentioned in the java file of each class,
+    the graph is built once from the inverted index of the classes scanner (each java file is read and scanned once,
+    then each class adds itself to the references of the classes whose files mention it),
+    then the classes related to an activity are all the classes reachable from it, the strongly connected components of the graph are found once
+    and the classes reachable from each component are kept, so they are shared by all the activities
+    """
+    def __init__(self, java_files, classes, classes_scanner=None):
+        """
+        Constructor
+        :param java_files: List of all java files in the project
+        :param classes: List of the java files classes names (check JavaFilesInfo.get_list_of_classes_names)
+        :param classes_scanner: ClassNamesScanner of the classes (a new one is used if not given)
+        """
+        self.java_files = java_files
+        self.classes_scanner = classes_scanner if classes_scanner is not None else ClassNamesScanner(classes)
+        self.classes = list()
+        self.classes_indexes = dict()
+        for class_name in classes:
+            if class_name not in self.classes_indexes:
+                self.classes_indexes[class_name] = len(self.classes)
+                self.classes.append(class_name)
+        self.classes_files = self.get_classes_files()
+        self.references = self.get_references()
+        self.components = list()
+        self.classes_components = list()
+        self.find_components()
+        self.components_reach = dict()
+
+    def get_classes_files(self):
+        """
+        This method finds the java file of each class, it is the first file which name ends with the class name
+        :return: dictionary {class_name: java_file}
+        """
+        classes_files = dict()
+        for java_file in self.java_files:
+            file_name = os.path.basename(java_file)
+            if not file_name.endswith(".java"):
+                continue
+            file_name = file_name[:-len(".java")]
+            for index in range(len(file_name)):
+                class_name = file_name[index:]
+                if class_name in self.classes_indexes and class_name not in classes_files:
+                    classes_files[class_name] = java_file
+        return classes_files
+
+    def get_references(self):
+        """
+        This method scans the classes files, then queries the inverted index for the files that mention each class,
+        and adds the class to the references of the classes of those files
+        :return: list of the mentioned classes indexes of each class, sorted
+        """
+        files_owners = dict()
+        for (index, class_name) in enumerate(self.classes):
+            java_file = self.classes_files.get(class_name)
+            if java_file is not None:
+                files_owners.setdefault(java_file, list()).append(index)
+        self.classes_scanner.scan_files(sorted(files_owners))
+        references = [list() for _ in self.classes]
+        for (reference, class_name) in enumerate(self.classes):
+            for java_file in self.classes_scanner.get_files_mentioning(class_name):
+                for owner in files_owners.get(java_file, list()):
+                    references[owner].append(reference)
+        return references
+
+    def get_file_references(self, java_file):
+        """
+        This method scans the given java file for the classes mentioned in it (the files of the project classes
+        are already in the references)
+        :param java_file: Java file path, or None
+        :return: list of the mentioned classes indexes
+        """
+        if java_file is None:
+            return list()
+        return sorted([self.classes_indexes[class_name] for class_name in self.classes_scanner.scan_file(java_file)])
+
+    def find_components(self):
+        """
+        This method finds the strongly connected components of the graph (Tarjan's algorithm, without recursion),
+        the components are found in a reverse topological order
+        :return: nothing, it sets the components and classes_components attributes
+        """
+        classes_count = len(self.classes)
+        visit_order = [-1] * classes_count
+        low_link = [0] * classes_count
+        on_stack = [False] * classes_count
+        self.classes_components = [-1] * classes_count
+        components_stack = list()
+        counter = 0
+        for root in range(classes_count):
+            if visit_order[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                (node, next_reference) = work.pop()
+                if next_reference == 0:
+                    visit_order[node] = low_link[node] = counter
+                    counter = counter + 1
+                    components_stack.append(node)
+                    on_stack[node] = True
+                references = self.references[node]
+                while next_reference < len(references):
+                    reference = references[next_reference]
+                    next_reference = next_reference + 1
+                    if visit_order[reference] == -1:
+                        work.append((node, next_reference))
+                        work.append((reference, 0))
+                        break
+                    elif on_stack[reference]:
+                        low_link[node] = min(low_link[node], visit_order[reference])
+                else:
+                    if low_link[node] == visit_order[node]:
+                        component = list()
+                        while True:
+                            member = components_stack.pop()
+                            on_stack[member] = False
+                            self.classes_components[member] = len(self.components)
+                            component.append(member)
+                            if member == node:
+                                break
+                        self.components.append(component)
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[node])
+
+    def get_component_reach(self, component):
+        """
+        This method finds the classes reachable from the given component, the result of each component is kept
+        :param component: component index
+        :return: bits of the reachable classes indexes
+        """
+        stack = [component]
+        while stack:
+            current = stack[-1]
+            if current in self.components_reach:
+                stack.pop()
+                continue
+            successors = set()
+            for member in self.components[current]:
+                for reference in self.references[member]:
+                    if self.classes_components[reference] != current:
+                        successors.add(self.classes_components[reference])
+            pending = [successor for successor in successors if successor not in self.components_reach]
+            if pending:
+                stack.extend(pending)
+                continue
+            reach = 0
+            for member in self.components[current]:
+                for reference in self.references[member]:
+                    reach = reach | (1 << reference)
+            for successor in successors:
+                reach = reach | self.components_reach[successor]
+            self.components_reach[current] = reach
+            stack.pop()
+        return self.components_reach[component]
+
+    def get_related_classes(self, class_name):
+        """
+        This method finds all the classes mentioned in the given class file, and in the files of those classes
+        recursively
+        :param class_name: class (or activity) name
+        :return: list of the related classes names, in the project classes order
+        """
+        if class_name in self.classes_indexes:
+            references = self.references[self.classes_indexes[class_name]]
+        else:
+            java_file = None
+            for file_path in self.java_files:
+                if file_path.endswith("%s.java" % class_name):
+                    java_file = file_path
+                    break
+            references = self.get_file_references(java_file)
+        reach = 0
+        for reference in references:
+            reach = reach | (1 << reference) | self.get_component_reach(self.classes_components[reference])
+        related_classes = list()
+        while reach:
+            lowest_bit = reach & -reach
+            related_classes.append(self.classes[lowest_bit.bit_length() - 1])
+            reach = reach ^ lowest_bit
+        return related_classes
@@ -10,6 +10,7 @@
 #################
 
 from ADPDException import ADPDException
+from ProjectArchive import ProjectArchive
 
 #############
 # CONSTANTS #
@@ -27,17 +28,67 @@ class CommonMethods(object):
         pass
 
     @staticmethod
-    def read_file(file_path):
+    def read_file(file_path, header=None):
         """
-        This method reads the file and return its content
+        This method reads the file and return its content, the file can be a member of a project archive
         :param file_path: the file to read
+        :param header: the file header if it was already read (check read_file_header), only the rest is read
         :return: content
         """
+        if header is not None and header[1] is None:
+            return header[0]
+        archive = ProjectArchive.get_archive_of(file_path)
+        if archive is not None:
+            return archive.read_member(file_path)
+        file = None
         try:
             file = open(file_path, "r")
-            data = file.read()
+            if header is not None:
+                file.seek(header[1])
+                data = header[0] + file.read()
+            else:
+                data = file.read()
         except Exception as exp:
             raise ADPDException(exp)
         finally:
-            file.close()
-        return data
\ No newline at end of file
+            if file is not None:
+                file.close()
+        return data
+
+    @staticmethod
+    def read_file_header(file_path, size):
+        """
+        This method reads only the beginning of the file
+        :param file_path: the file to read
+        :param size: number of characters to read
+        :return: tuple (header, position after the header or None if the whole file was read)
+        """
+        archive = ProjectArchive.get_archive_of(file_path)
+        file = None
+        try:
+            file = archive.open_member(file_path) if archive is not None else open(file_path, "r")
+            header = file.read(size)
+            position = file.tell() if archive is None else len(header)
+            if not file.read(1):
+                position = None
+        except Exception as exp:
+            raise ADPDException(exp)
+        finally:
+            if file is not None:
+                file.close()
+        return (header, position)
+
+    @staticmethod
+    def open_file(file_path):
+        """
+        This method opens the file for reading, the file can be a member of a project archive
+        :param file_path: the file to open
+        :return: file object
+        """
+        archive = ProjectArchive.get_archive_of(file_path)
+        if archive is not None:
+            return archive.open_member(file_path)
+        try:
+            return open(file_path, "r")
+        except Exception as exp:
+            raise ADPDException(exp)
\ No newline at end of file
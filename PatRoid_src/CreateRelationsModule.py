@@ -36,12 +36,10 @@ class CreateRelationsModule(object):
         """
         Add the given relations to the given node
         :param node: dep, ass, agg or inh node
-        :param relations: list of dictionaries
+        :param relations: RelationsStore
         :return: nothing
         """
-        for relation in relations:
-            cj = relation.keys()[0]
-            ci = relation.values()[0]
+        for (ci, cj) in relations.get_relations():
             relation_node =  ET.SubElement(node, "relation")
             relation_node.set("ci", ci)
             relation_node.set("cj", cj)
@@ -50,7 +48,7 @@ class CreateRelationsModule(object):
         """
         This method add the depends relationships to the module root
         :param root: Tree root
-        :param depends_relations: list of dictionary
+        :param depends_relations: RelationsStore
         :return: nothing
         """
         depends = ET.SubElement(root, "depends")
@@ -60,7 +58,7 @@ class CreateRelationsModule(object):
         """
         This method add the association relationships to the module root
         :param root: Tree root
-        :param association_relations: list of dictionary
+        :param association_relations: RelationsStore
         :return: nothing
         """
         association = ET.SubElement(root, "association")
@@ -70,7 +68,7 @@ class CreateRelationsModule(object):
         """
         This method add the inheritance relationships to the module root
         :param root: Tree root
-        :param inheritance_relations: list of dictionary
+        :param inheritance_relations: RelationsStore
         :return: nothing
         """
         inheritance = ET.SubElement(root, "inheritance")
@@ -80,7 +78,7 @@ class CreateRelationsModule(object):
         """
         This method add the aggregation relationships to the module root
         :param root: Tree root
-        :param aggregation_relations: list of dictionary
+        :param aggregation_relations: RelationsStore
         :return: nothing
         """
         aggregation = ET.SubElement(root, "aggregation")
@@ -97,6 +95,8 @@ class CreateRelationsModule(object):
         for activity in manifest_info:
             activity_node = ET.SubElement(manifest, "activity")
             activity_node.set('name', activity.get("name"))
+            if activity.get("module") is not None:
+                activity_node.set('module', activity.get("module"))
             category = ('None', activity.get("category"))[activity.get("category") is not None]
             activity_node.set('category', category)
             related_classes = ET.SubElement(activity_node, "related_classes")
@@ -110,10 +110,10 @@ class CreateRelationsModule(object):
                                aggregation_relations, manifest_info):
         """
         Build the whole module and write to XML file
-        :param depends_relations: list of dictionary
-        :param association_relations: list of dictionary
-        :param inheritance_relations: list of dictionary
-        :param aggregation_relations: list of dictionary
+        :param depends_relations: RelationsStore
+        :param association_relations: RelationsStore
+        :param inheritance_relations: RelationsStore
+        :param aggregation_relations: RelationsStore
         :param manifest_info: dictionary
         :return: nothing
         """
@@ -10,6 +10,7 @@
 #################
 
 from ADPDException import ADPDException
+from SubPatterns import SUB_PATTERNS
 from Logger import Logger
 
 logger = Logger()
@@ -19,17 +20,112 @@ logger = Logger()
 # CONSTANTS #
 #############
 
+# All the design patterns in the order they are detected
+DESIGN_PATTERNS = ["singleton", "composite", "template", "abstract_factory", "adapter", "bridge", "builder",
+                   "chain_of_responsibility", "command", "decorator", "facad", "factory", "flyweight", "interpreter",
+                   "iterator", "mediator", "memento", "observer", "prototype", "proxy", "state", "strategy", "visitor"]
+# The sub-patterns each design pattern detector uses, in the order of the detector arguments
+DESIGN_PATTERNS_SUB_PATTERNS = {"singleton": ["SASS"],
+                                "composite": ["SAGG", "CI", "IIAGG", "IAGG"],
+                                "template": ["CI"],
+                                "abstract_factory": ["DCI", "ICD", "CI"],
+                                "adapter": ["CI", "ICA"],
+                                "bridge": ["IPAG", "CI"],
+                                "builder": ["ICA", "AGPI"],
+                                "chain_of_responsibility": ["SASS", "CI"],
+                                "command": ["AGPI", "ICA"],
+                                "decorator": ["CI", "IAGG", "MLI"],
+                                "facad": ["ICD"],
+                                "factory": ["ICD", "DCI"],
+                                "flyweight": ["CI", "AGPI"],
+                                "interpreter": ["IAGG", "IPD", "CI"],
+                                "iterator": ["DCI", "ICA", "ICD"],
+                                "mediator": ["ICA", "CI", "IPAS"],
+                                "memento": ["AGPI", "DPI"],
+                                "observer": ["AGPI", "ICD"],
+                                "prototype": ["CI", "AGPI"],
+                                "proxy": ["CI", "ICA", "IASS"],
+                                "state": ["AGPI", "CI"],
+                                "strategy": ["AGPI", "CI"],
+                                "visitor": ["AGPI", "ICD", "DPI"]}
+
 
 class DetectDP(object):
     """
     This class contains all the methods needed to analyze sub-patterns and extract design patterns from them
     """
 
-    def __init__(self):
+    def __init__(self, symbol_table=None):
         """
         Constructor
+        :param symbol_table: SymbolTable of the classes ids in the sub-patterns, None if they are classes names
+        """
+        self.symbol_table = symbol_table
+
+    def get_names(self, value):
+        """
+        Resolve the classes ids in the given design pattern location to the classes names
+        :param value: id, or a tuple, list or dictionary that contains ids
+        :return: the value with names instead of the ids
+        """
+        if self.symbol_table is None:
+            return value
+        return self.symbol_table.get_names(value)
+
+    @staticmethod
+    def get_design_patterns(patterns=None):
+        """
+        This method checks the requested design patterns and orders them by the detection order
+        :param patterns: list of design patterns names, None means all the design patterns
+        :return: list of design patterns names
+        """
+        if patterns is None:
+            return list(DESIGN_PATTERNS)
+        unknown_patterns = [pattern for pattern in patterns if pattern not in DESIGN_PATTERNS]
+        if unknown_patterns:
+            raise ADPDException("Unknown design patterns: %s, the supported design patterns are: %s"
+                                % (", ".join(unknown_patterns), ", ".join(DESIGN_PATTERNS)))
+        return [pattern for pattern in DESIGN_PATTERNS if pattern in patterns]
+
+    @staticmethod
+    def get_needed_sub_patterns(patterns=None):
+        """
+        This method finds the sub-patterns that the detectors of the given design patterns use
+        :param patterns: list of design patterns names, None means all the design patterns
+        :return: list of sub-patterns names, in the sub-patterns definition order
+        """
+        needed_sub_patterns = set()
+        for pattern in DetectDP.get_design_patterns(patterns):
+            needed_sub_patterns.update(DESIGN_PATTERNS_SUB_PATTERNS[pattern])
+        return [sub_pattern for sub_pattern in SUB_PATTERNS if sub_pattern in needed_sub_patterns]
+
+    def detect(self, pattern, sub_patterns_relations):
+        """
+        This method calls the detector of the given design pattern with the sub-patterns it uses
+        :param pattern: design pattern name
+        :param sub_patterns_relations: dictionary {sub_pattern: list of tuples}
+        :return: DP location
+        """
+        detector = getattr(self, "detect_%s" % pattern)
+        return detector(*[sub_patterns_relations[sub_pattern] for sub_pattern in DESIGN_PATTERNS_SUB_PATTERNS[pattern]])
+
+    @staticmethod
+    def index_sub_pattern(sub_pattern, *positions):
+        """
+        This method indexes the tuples of a sub-pattern by the classes in the given positions (roles),
+        so the detectors can join the sub-patterns by looking the matching tuples up instead of scanning them all
+        :param sub_pattern: list of tuples
+        :param positions: the positions of the classes to index by
+        :return: dictionary {class (or tuple of classes for many positions): list of tuples in the sub-pattern order}
         """
-        pass
+        index = dict()
+        for relation in sub_pattern:
+            if len(positions) == 1:
+                key = relation[positions[0]]
+            else:
+                key = tuple([relation[position] for position in positions])
+            index.setdefault(key, list()).append(relation)
+        return index
 
     def detect_singleton(self, sass_sub_pattern):
         """
@@ -42,10 +138,10 @@ class DetectDP(object):
         logger.info("Singleton can be founded by combination of SASS")
         for sass in sass_sub_pattern:
             dp = {"SASS": sass}
-            logger.debug("Singleton DP in: %s" % str(dp))
+            logger.debug("Singleton DP in: %s" % str(self.get_names(dp)))
             singleton_dp.append(dp)
         if len(singleton_dp):
-            logger.info("Singleton design pattern has been detected: %s" % singleton_dp)
+            logger.info("Singleton design pattern has been detected: %s" % self.get_names(singleton_dp))
         else:
             logger.warning("Couldn't find any Singleton pattern in the code")
         return singleton_dp
@@ -63,34 +159,39 @@ class DetectDP(object):
         if len(sagg_sub_pattern):
             for sagg in sagg_sub_pattern:
                 dp = {"SAGG": sagg}
-                logger.debug("Composite DP in: %s" % str(dp))
+                logger.debug("Composite DP in: %s" % str(self.get_names(dp)))
                 composite_dp.append(dp)
         logger.debug("Step2: checking for CI & IAGG")
         if len(ci_sub_pattern) and len(iagg_sub_pattern):
+            # the component is the IAGG child if the CI parent is the IAGG parent, and the IAGG parent otherwise
+            iagg_indexes_by_parent = dict()
+            for (index, iagg) in enumerate(iagg_sub_pattern):
+                iagg_indexes_by_parent.setdefault(iagg[0], list()).append(index)
             for ci in ci_sub_pattern:
-                index = 0
                 parent = ci[0]
-                while index < len(iagg_sub_pattern):
-                    comp = (iagg_sub_pattern[index][0], iagg_sub_pattern[index][1])[
-                        parent == iagg_sub_pattern[index][0]]
-                    if comp in ci:
-                        dp = {"CI": ci, "IAGG": iagg_sub_pattern[index]}
-                        logger.debug("Composite DP in: %s" % str(dp))
-                        composite_dp.append(dp)
-                    index = index + 1
+                indexes = [index for index in iagg_indexes_by_parent.get(parent, ())
+                           if iagg_sub_pattern[index][1] in ci]
+                for comp in set(ci[1:]) - set([parent]):
+                    indexes.extend(iagg_indexes_by_parent.get(comp, ()))
+                for index in sorted(indexes):
+                    dp = {"CI": ci, "IAGG": iagg_sub_pattern[index]}
+                    logger.debug("Composite DP in: %s" % str(self.get_names(dp)))
+                    composite_dp.append(dp)
         logger.debug("Step3: checking for CI & IIAGG")
         if len(ci_sub_pattern) and len(iiagg_sub_pattern):
+            iiagg_indexes_by_comp = dict()
+            for (index, iiagg) in enumerate(iiagg_sub_pattern):
+                iiagg_indexes_by_comp.setdefault(iiagg[2], list()).append(index)
             for ci in ci_sub_pattern:
-                index = 0
-                while index < len(iiagg_sub_pattern):
-                    comp = iiagg_sub_pattern[index][2]
-                    if comp in ci:
-                        dp = {"CI": ci, "IIAGG": iagg_sub_pattern[index]}
-                        logger.debug("Composite DP in: %s" % str(dp))
-                        composite_dp.append(dp)
-                    index = index + 1
+                indexes = list()
+                for comp in set(ci):
+                    indexes.extend(iiagg_indexes_by_comp.get(comp, ()))
+                for index in sorted(indexes):
+                    dp = {"CI": ci, "IIAGG": iagg_sub_pattern[index]}
+                    logger.debug("Composite DP in: %s" % str(self.get_names(dp)))
+                    composite_dp.append(dp)
         if len(composite_dp):
-            logger.info("Composite design pattern has been detected: %s" % composite_dp)
+            logger.info("Composite design pattern has been detected: %s" % self.get_names(composite_dp))
         else:
             logger.warning("Couldn't find any composite pattern in the code")
         return composite_dp
@@ -106,10 +207,10 @@ class DetectDP(object):
         logger.info("Template can be founded by combination of CI relation")
         for ci in ci_sub_pattern:
             dp = {"CI": ci}
-            logger.debug("Template DP in: %s" % str(dp))
+            logger.debug("Template DP in: %s" % str(self.get_names(dp)))
             template_dp.append(dp)
         if len(template_dp):
-            logger.info("Template design pattern has been detected: %s" % template_dp)
+            logger.info("Template design pattern has been detected: %s" % self.get_names(template_dp))
         else:
             logger.warning("Couldn't find any Template pattern in the code")
         return template_dp
@@ -123,13 +224,14 @@ class DetectDP(object):
         adapter_dp = list()
         logger.info("Checking for Adapter Design Pattern")
         logger.info("Adapter can be founded by combination of ICA relation and a non-existance of CI relation")
+        ci_relations = set(ci_sub_pattern)
         for dp in ica_sub_pattern:
-            if dp not in ci_sub_pattern:
-                logger.debug("Adapter DP in: %s" % str(dp))
+            if dp not in ci_relations:
+                logger.debug("Adapter DP in: %s" % str(self.get_names(dp)))
                 adapter = {"ICA": dp}
                 adapter_dp.append(adapter)
         if len(adapter_dp):
-            logger.info("Adapter design pattern has been detected: %s" % adapter_dp)
+            logger.info("Adapter design pattern has been detected: %s" % self.get_names(adapter_dp))
         else:
             logger.warning("Couldn't find any adapter pattern in the code")
         return adapter_dp
@@ -143,18 +245,19 @@ class DetectDP(object):
         bridge_dp = list()
         logger.info("Checking for Bridge Design Pattern")
         logger.info("Bridge can be founded by combination of IPAG and CI")
+        ipag_by_implementor = self.index_sub_pattern(ipag_sub_pattern, 2)
         for ci in ci_sub_pattern:
             implementor = ci[0]
             ci1 = ci[1]
             ci2 = ci[2]
-            for ipag in ipag_sub_pattern:
+            for ipag in ipag_by_implementor.get(implementor, ()):
                 if ci1 and ci2 not in ipag:
                     if implementor == ipag[2]:
                         dp = {"CI": ci, "IPAG": ipag}
-                        logger.debug("Bridge DP in: %s" % str(dp))
+                        logger.debug("Bridge DP in: %s" % str(self.get_names(dp)))
                         bridge_dp.append(dp)
         if len(bridge_dp):
-            logger.info("Bridge design pattern has been detected: %s" % bridge_dp)
+            logger.info("Bridge design pattern has been detected: %s" % self.get_names(bridge_dp))
         else:
             logger.warning("Couldn't find any bridge pattern in the code")
         return bridge_dp
@@ -168,22 +271,24 @@ class DetectDP(object):
         proxy_dp = list()
         logger.info("Checking for Proxy Design Pattern")
         logger.info("Proxy can be founded by combination of ICA & CI, CI & IASS")
+        ica_by_subject = self.index_sub_pattern(ica_sub_pattern, 0)
+        iass_by_subject = self.index_sub_pattern(iass_sub_pattern, 0)
         for ci in ci_sub_pattern:
             subject = ci[0]
             real_subject = ci[1]
             proxy = ci[2]
-            for ica in ica_sub_pattern:
+            for ica in ica_by_subject.get(subject, ()):
                 if (subject == ica[0]) and (proxy and real_subject in (ica[1], ica[2])):
                     dp = {"ICA": ica, "CI": ci}
-                    logger.debug("Proxy DP in: %s" % str(dp))
+                    logger.debug("Proxy DP in: %s" % str(self.get_names(dp)))
                     proxy_dp.append(dp)
-            for iass in iass_sub_pattern:
-                if (subject == iass[0]) and (proxy or real_subject in (iass[1])):
+            for iass in iass_by_subject.get(subject, ()):
+                if (subject == iass[0]) and (proxy or self.get_names(real_subject) in self.get_names(iass[1])):
                     dp = {"IASS": iass, "CI": ci}
-                    logger.debug("Proxy DP in: %s" % str(dp))
+                    logger.debug("Proxy DP in: %s" % str(self.get_names(dp)))
                     proxy_dp.append(dp)
         if len(proxy_dp):
-            logger.info("Proxy design pattern has been detected: %s" % proxy_dp)
+            logger.info("Proxy design pattern has been detected: %s" % self.get_names(proxy_dp))
         else:
             logger.warning("Couldn't find any proxy pattern in the code")
         return proxy_dp
@@ -197,18 +302,20 @@ class DetectDP(object):
         decorator_dp = list()
         logger.info("Checking for Decorator Design Pattern")
         logger.info("Decorator can be founded by combination of CI & IAGG & MLI")
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
+        iagg_by_classes = self.index_sub_pattern(iagg_sub_pattern, 0, 1)
         for mli in mli_sub_pattern:
             comp = mli[0]
             decorator = mli[1]
-            for ci in ci_sub_pattern:
+            for ci in ci_by_parent.get(comp, ()):
                 if (comp == ci[0]) and (decorator in (ci[1], ci[2])):
-                    for iagg in iagg_sub_pattern:
+                    for iagg in iagg_by_classes.get((comp, decorator), ()):
                         if comp == iagg[0] and decorator == iagg[1]:
                             dp = {"IAGG": iagg, "CI": ci, "MLI": mli}
-                            logger.debug("Decorator DP in: %s" % str(dp))
+                            logger.debug("Decorator DP in: %s" % str(self.get_names(dp)))
                             decorator_dp.append(dp)
         if len(decorator_dp):
-            logger.info("Decorator design pattern has been detected: %s" % decorator_dp)
+            logger.info("Decorator design pattern has been detected: %s" % self.get_names(decorator_dp))
         else:
             logger.warning("Couldn't find any decorator pattern in the code")
         return decorator_dp
@@ -222,15 +329,16 @@ class DetectDP(object):
         flyweight_dp = list()
         logger.info("Checking for Flyweight Design Pattern")
         logger.info("Flyweight can be founded by combination of CI & AGPI")
+        agpi_by_parent = self.index_sub_pattern(agpi_sub_pattern, 0)
         for ci in ci_sub_pattern:
             flyweight = ci[0]
-            for agpi in agpi_sub_pattern:
+            for agpi in agpi_by_parent.get(flyweight, ()):
                 if flyweight == agpi[0] and agpi[1] in (ci[1], ci[2]) and agpi[2] not in (ci[1], ci[2]):
                     dp = {"AGPI": agpi, "CI": ci}
-                    logger.debug("Flyweight DP in: %s" % str(dp))
+                    logger.debug("Flyweight DP in: %s" % str(self.get_names(dp)))
                     flyweight_dp.append(dp)
         if len(flyweight_dp):
-            logger.info("Flyweight design pattern has been detected: %s" % flyweight_dp)
+            logger.info("Flyweight design pattern has been detected: %s" % self.get_names(flyweight_dp))
         else:
             logger.warning("Couldn't find any flyweight pattern in the code")
         return flyweight_dp
@@ -244,6 +352,8 @@ class DetectDP(object):
         facad_dp = list()
         logger.info("Checking for Facad Design Pattern")
         logger.info("Facad can be founded by combination of triple ICD")
+        icd_by_child = self.index_sub_pattern(icd_sub_pattern, 0, 1)
+        found_dps = set()
         for icd in icd_sub_pattern:
             parent = icd[0]
             child = icd[1]
@@ -251,18 +361,19 @@ class DetectDP(object):
             number_of_sub_system = 0
             icd_name = "ICD%s" % number_of_sub_system
             dp = {icd_name: icd}
-            for inner_icd in icd_sub_pattern:
+            for inner_icd in icd_by_child[(parent, child)]:
                 if parent == inner_icd[0] and child == inner_icd[1] and sub_system != inner_icd[2]:
                     number_of_sub_system = number_of_sub_system + 1
                     icd_name = "ICD%s" % number_of_sub_system
                     dp[icd_name] = inner_icd
                 if number_of_sub_system > 1:
-                    if dp not in facad_dp:
+                    if frozenset(dp.items()) not in found_dps:
+                        found_dps.add(frozenset(dp.items()))
                         facad_dp.append(dp)
-                        logger.debug("Facad DP in: %s" % str(dp))
+                        logger.debug("Facad DP in: %s" % str(self.get_names(dp)))
                     break
         if len(facad_dp):
-            logger.info("Facad design pattern has been detected: %s" % facad_dp)
+            logger.info("Facad design pattern has been detected: %s" % self.get_names(facad_dp))
         else:
             logger.warning("Couldn't find any Facad pattern in the code")
         return facad_dp
@@ -276,21 +387,23 @@ class DetectDP(object):
         abstract_factory_dp = list()
         logger.info("Checking for Abstract Factory Design Pattern")
         logger.info("Abstract Factory can be founded by combination of DCI & IDC & CI")
+        dci_by_concrete_factory = self.index_sub_pattern(dci_sub_pattern, 2)
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for icd in icd_sub_pattern:
             concrete_factory = icd[1]
             product_a = icd[2]
-            for dci in dci_sub_pattern:
+            for dci in dci_by_concrete_factory.get(concrete_factory, ()):
                 abstract_product = dci[0]
                 product_b = dci[1]
                 dci_concrete_factory = dci[2]
                 if dci_concrete_factory == concrete_factory:
-                    for ci in ci_sub_pattern:
+                    for ci in ci_by_parent.get(abstract_product, ()):
                         if (ci[0] == abstract_product) and (product_a and product_b in (ci[1], ci[2])):
                             dp = {"ICD": icd, "DCI": dci, "CI": ci}
-                            logger.debug("Abstract Factory DP in: %s" % str(dp))
+                            logger.debug("Abstract Factory DP in: %s" % str(self.get_names(dp)))
                             abstract_factory_dp.append(dp)
         if len(abstract_factory_dp):
-            logger.info("Abstract Factory design pattern has been detected: %s" % abstract_factory_dp)
+            logger.info("Abstract Factory design pattern has been detected: %s" % self.get_names(abstract_factory_dp))
         else:
             logger.warning("Couldn't find any Abstract Factory pattern in the code")
         return abstract_factory_dp
@@ -304,17 +417,18 @@ class DetectDP(object):
         builder_dp = list()
         logger.info("Checking for Builder Design Pattern")
         logger.info("Builder can be founded by combination of IDA & AGPI")
+        agpi_by_classes = self.index_sub_pattern(agpi_sub_pattern, 0, 1)
         for ica in ica_sub_pattern:
             builder = ica[0]
             concrete_builder = ica[1]
             product = ica[2]
-            for agpi in agpi_sub_pattern:
+            for agpi in agpi_by_classes.get((builder, concrete_builder), ()):
                 if agpi[0] == builder and agpi[1] == concrete_builder and agpi[2] != product:
                     dp = {"ICA": ica, "AGPI": agpi}
-                    logger.debug("Builder DP in: %s" % str(dp))
+                    logger.debug("Builder DP in: %s" % str(self.get_names(dp)))
                     builder_dp.append(dp)
         if len(builder_dp):
-            logger.info("Builder design pattern has been detected: %s" % builder_dp)
+            logger.info("Builder design pattern has been detected: %s" % self.get_names(builder_dp))
         else:
             logger.warning("Couldn't find any Builder pattern in the code")
         return builder_dp
@@ -328,16 +442,17 @@ class DetectDP(object):
         factory_dp = list()
         logger.info("Checking for Factory Design Pattern")
         logger.info("Factory can be founded by combination of ICD & DCI")
+        icd_by_classes = self.index_sub_pattern(icd_sub_pattern, 1, 2)
         for dci in dci_sub_pattern:
             concrete_product = dci[1]
             concrete_creator = dci[2]
-            for icd in icd_sub_pattern:
+            for icd in icd_by_classes.get((concrete_creator, concrete_product), ()):
                 if icd[1] == concrete_creator and icd[2] == concrete_product and icd[0] not in dci:
                     dp = {"ICD": icd, "DCI": dci}
-                    logger.debug("Factory DP in: %s" % str(dp))
+                    logger.debug("Factory DP in: %s" % str(self.get_names(dp)))
                     factory_dp.append(dp)
         if len(factory_dp):
-            logger.info("Factory design pattern has been detected: %s" % factory_dp)
+            logger.info("Factory design pattern has been detected: %s" % self.get_names(factory_dp))
         else:
             logger.warning("Couldn't find any Factory pattern in the code")
         return factory_dp
@@ -351,16 +466,17 @@ class DetectDP(object):
         prototype_dp = list()
         logger.info("Checking for Prototype Design Pattern")
         logger.info("Prototype can be founded by combination of CI & AGPI")
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for agpi in agpi_sub_pattern:
             prototype = agpi[0]
             con_proto_a = agpi[1]
-            for ci in ci_sub_pattern:
+            for ci in ci_by_parent.get(prototype, ()):
                 if prototype == ci[0] and con_proto_a in ci and agpi[2] not in ci:
                     dp = {"CI": ci, "AGPI": agpi}
-                    logger.debug("Prototype DP in: %s" % str(dp))
+                    logger.debug("Prototype DP in: %s" % str(self.get_names(dp)))
                     prototype_dp.append(dp)
         if len(prototype_dp):
-            logger.info("Prototype design pattern has been detected: %s" % prototype_dp)
+            logger.info("Prototype design pattern has been detected: %s" % self.get_names(prototype_dp))
         else:
             logger.warning("Couldn't find any Prototype pattern in the code")
         return prototype_dp
@@ -374,14 +490,15 @@ class DetectDP(object):
         chain_of_responsibility_dp = list()
         logger.info("Checking for Chain of Responsibility Design Pattern")
         logger.info("Chain of Responsibility can be founded by combination of SASS & CI")
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for sass in sass_sub_pattern:
-            for ci in ci_sub_pattern:
+            for ci in ci_by_parent.get(sass[0], ()):
                 if sass[0] == ci[0]:
                     dp = {"SASS": sass, "CI": ci}
-                    logger.debug("Chain of Responsibility DP in: %s" % str(dp))
+                    logger.debug("Chain of Responsibility DP in: %s" % str(self.get_names(dp)))
                     chain_of_responsibility_dp.append(dp)
         if len(chain_of_responsibility_dp):
-            logger.info("Chain of Responsibility design pattern has been detected: %s" % chain_of_responsibility_dp)
+            logger.info("Chain of Responsibility design pattern has been detected: %s" % self.get_names(chain_of_responsibility_dp))
         else:
             logger.warning("Couldn't find any Chain of Responsibility pattern in the code")
         return chain_of_responsibility_dp
@@ -395,16 +512,17 @@ class DetectDP(object):
         command_dp = list()
         logger.info("Checking for Command Design Pattern")
         logger.info("Command can be founded by combination of ICA & AGPI")
+        ica_by_classes = self.index_sub_pattern(ica_sub_pattern, 0, 1)
         for agpi in agpi_sub_pattern:
             command = agpi[0]
             conc_command = agpi[1]
-            for ica in ica_sub_pattern:
+            for ica in ica_by_classes.get((command, conc_command), ()):
                 if command == ica[0] and conc_command == ica[1] and agpi[2] != ica[2]:
                     dp = {"ICA": ica, "AGPI": agpi}
-                    logger.debug("Command DP in: %s" % str(dp))
+                    logger.debug("Command DP in: %s" % str(self.get_names(dp)))
                     command_dp.append(dp)
         if len(command_dp):
-            logger.info("Command design pattern has been detected: %s" % command_dp)
+            logger.info("Command design pattern has been detected: %s" % self.get_names(command_dp))
         else:
             logger.warning("Couldn't find any Command pattern in the code")
         return command_dp
@@ -418,19 +536,21 @@ class DetectDP(object):
         interpreter_dp = list()
         logger.info("Checking for Interpreter Design Pattern")
         logger.info("Interpreter can be founded by combination of IAGG & CI & IPD")
+        ipd_by_parent = self.index_sub_pattern(ipd_sub_pattern, 0)
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for iagg in iagg_sub_pattern:
             abstract_expression = iagg[0]
             nonterminatl_expression = iagg[1]
-            for ipd in ipd_sub_pattern:
+            for ipd in ipd_by_parent.get(abstract_expression, ()):
                 content = ipd[2]
                 if abstract_expression == ipd[0]:
-                    for ci in ci_sub_pattern:
+                    for ci in ci_by_parent.get(abstract_expression, ()):
                         if abstract_expression == ci[0] and nonterminatl_expression in ci and content not in ci:
                             dp = {"IAGG": iagg, "IPD": ipd, "CI": ci}
-                            logger.debug("Interpreter DP in: %s" % str(dp))
+                            logger.debug("Interpreter DP in: %s" % str(self.get_names(dp)))
                             interpreter_dp.append(dp)
         if len(interpreter_dp):
-            logger.info("Interpreter design pattern has been detected: %s" % interpreter_dp)
+            logger.info("Interpreter design pattern has been detected: %s" % self.get_names(interpreter_dp))
         else:
             logger.warning("Couldn't find any Interpreter pattern in the code")
         return interpreter_dp
@@ -444,19 +564,21 @@ class DetectDP(object):
         iterator_dp = list()
         logger.info("Checking for Iterator Design Pattern")
         logger.info("Iterator can be founded by combination of ICD & DCI & ICA")
+        dci_by_classes = self.index_sub_pattern(dci_sub_pattern, 0, 1, 2)
+        icd_by_classes = self.index_sub_pattern(icd_sub_pattern, 1, 2)
         for ica in ica_sub_pattern:
             iterator = ica[0]
             conc_iterator = ica[1]
             conc_agg = ica[2]
-            for dci in dci_sub_pattern:
+            for dci in dci_by_classes.get((iterator, conc_iterator, conc_agg), ()):
                 if iterator == dci[0] and conc_iterator == dci[1] and conc_agg == dci[2]:
-                    for icd in icd_sub_pattern:
+                    for icd in icd_by_classes.get((conc_agg, conc_iterator), ()):
                         if conc_agg == icd[1] and conc_iterator == icd[2] and icd[0] not in ica:
                             dp = {"DCI": dci, "ICA": ica, "ICD": icd}
-                            logger.debug("Iterator DP in: %s" % str(dp))
+                            logger.debug("Iterator DP in: %s" % str(self.get_names(dp)))
                             iterator_dp.append(dp)
         if len(iterator_dp):
-            logger.info("Iterator design pattern has been detected: %s" % iterator_dp)
+            logger.info("Iterator design pattern has been detected: %s" % self.get_names(iterator_dp))
         else:
             logger.warning("Couldn't find any Iterator pattern in the code")
         return iterator_dp
@@ -470,20 +592,22 @@ class DetectDP(object):
         mediator_dp = list()
         logger.info("Checking for Mediator Design Pattern")
         logger.info("Mediator can be founded by combination of CI & IPAS & ICA")
+        ipas_by_mediator = self.index_sub_pattern(ipas_sub_pattern, 2)
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for ica in ica_sub_pattern:
             mediator = ica[0]
             conc_colleague_a = ica[2]
-            for ipas in ipas_sub_pattern:
+            for ipas in ipas_by_mediator.get(mediator, ()):
                 if mediator == ipas[2]:
                     colleague = ipas[0]
                     conc_colleague_b = ipas[1]
-                    for ci in ci_sub_pattern:
+                    for ci in ci_by_parent.get(colleague, ()):
                         if colleague == ci[0] and (conc_colleague_a and conc_colleague_b in ci):
                             dp = {"CI": ci, "ICA": ica, "IPAS": ipas}
-                            logger.debug("Mediator DP in: %s" % str(dp))
+                            logger.debug("Mediator DP in: %s" % str(self.get_names(dp)))
                             mediator_dp.append(dp)
         if len(mediator_dp):
-            logger.info("Mediator design pattern has been detected: %s" % mediator_dp)
+            logger.info("Mediator design pattern has been detected: %s" % self.get_names(mediator_dp))
         else:
             logger.warning("Couldn't find any Mediator pattern in the code")
         return mediator_dp
@@ -497,16 +621,17 @@ class DetectDP(object):
         memento_dp = list()
         logger.info("Checking for Memento Design Pattern")
         logger.info("Memento can be founded by combination of AGPI & DPI")
+        dpi_by_classes = self.index_sub_pattern(dpi_sub_pattern, 0, 1)
         for agpi in agpi_sub_pattern:
             memento = agpi[0]
             memento_imp = agpi[1]
-            for dpi in dpi_sub_pattern:
+            for dpi in dpi_by_classes.get((memento, memento_imp), ()):
                 if memento == dpi[0] and memento_imp == dpi[1] and agpi[2] != dpi[2]:
                     dp = {"AGPI": agpi, "DPI": dpi}
-                    logger.debug("Memento DP in: %s" % str(dp))
+                    logger.debug("Memento DP in: %s" % str(self.get_names(dp)))
                     memento_dp.append(dp)
         if len(memento_dp):
-            logger.info("Memento design pattern has been detected: %s" % memento_dp)
+            logger.info("Memento design pattern has been detected: %s" % self.get_names(memento_dp))
         else:
             logger.warning("Couldn't find any Memento pattern in the code")
         return memento_dp
@@ -520,17 +645,18 @@ class DetectDP(object):
         observer_dp = list()
         logger.info("Checking for Observer Design Pattern")
         logger.info("Observer can be founded by combination of AGPI & ICD")
+        agpi_by_classes = self.index_sub_pattern(agpi_sub_pattern, 0, 1)
         for icd in icd_sub_pattern:
             observer = icd[0]
             conc_observer = icd[1]
             conc_subject = icd[2]
-            for agpi in agpi_sub_pattern:
+            for agpi in agpi_by_classes.get((observer, conc_observer), ()):
                 if observer == agpi[0] and conc_observer == agpi[1] and conc_subject != agpi[2]:
                     dp = {"AGPI": agpi, "ICD": icd}
-                    logger.debug("Observer DP in: %s" % str(dp))
+                    logger.debug("Observer DP in: %s" % str(self.get_names(dp)))
                     observer_dp.append(dp)
         if len(observer_dp):
-            logger.info("Observer design pattern has been detected: %s" % observer_dp)
+            logger.info("Observer design pattern has been detected: %s" % self.get_names(observer_dp))
         else:
             logger.warning("Couldn't find any Observer pattern in the code")
         return observer_dp
@@ -544,16 +670,17 @@ class DetectDP(object):
         state_dp = list()
         logger.info("Checking for State Design Pattern")
         logger.info("State can be founded by combination of AGPI & CI")
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for agpi in agpi_sub_pattern:
             state = agpi[0]
             conc_state_a = agpi[1]
-            for ci in ci_sub_pattern:
+            for ci in ci_by_parent.get(state, ()):
                 if state == ci[0] and conc_state_a in ci:
                     dp = {"AGPI": agpi, "CI": ci}
-                    logger.debug("State DP in: %s" % str(dp))
+                    logger.debug("State DP in: %s" % str(self.get_names(dp)))
                     state_dp.append(dp)
         if len(state_dp):
-            logger.info("State design pattern has been detected: %s" % state_dp)
+            logger.info("State design pattern has been detected: %s" % self.get_names(state_dp))
         else:
             logger.warning("Couldn't find any State pattern in the code")
         return state_dp
@@ -567,16 +694,17 @@ class DetectDP(object):
         strategy_dp = list()
         logger.info("Checking for Strategy Design Pattern")
         logger.info("Strategy can be founded by combination of AGPI & CI")
+        ci_by_parent = self.index_sub_pattern(ci_sub_pattern, 0)
         for agpi in agpi_sub_pattern:
             strategy = agpi[0]
             conc_strategy_a = agpi[1]
-            for ci in ci_sub_pattern:
+            for ci in ci_by_parent.get(strategy, ()):
                 if strategy == ci[0] and conc_strategy_a in ci:
                     dp = {"AGPI": agpi, "CI": ci}
-                    logger.debug("Strategy DP in: %s" % str(dp))
+                    logger.debug("Strategy DP in: %s" % str(self.get_names(dp)))
                     strategy_dp.append(dp)
         if len(strategy_dp):
-            logger.info("Strategy design pattern has been detected: %s" % strategy_dp)
+            logger.info("Strategy design pattern has been detected: %s" % self.get_names(strategy_dp))
         else:
             logger.warning("Couldn't find any Strategy pattern in the code")
         return strategy_dp
@@ -590,19 +718,21 @@ class DetectDP(object):
         visitor_dp = list()
         logger.info("Checking for Visitor Design Pattern")
         logger.info("Visitor can be founded by combination of AGPI & ICD & DPI")
+        dpi_by_classes = self.index_sub_pattern(dpi_sub_pattern, 0, 1)
+        agpi_by_classes = self.index_sub_pattern(agpi_sub_pattern, 0, 1)
         for icd in icd_sub_pattern:
             visitor = icd[0]
             conc_visitor = icd[1]
             conc_element = icd [2]
-            for dpi in dpi_sub_pattern:
+            for dpi in dpi_by_classes.get((visitor, conc_visitor), ()):
                 if visitor == dpi[0] and conc_visitor == dpi[1]:
-                    for agpi in agpi_sub_pattern:
+                    for agpi in agpi_by_classes.get((dpi[2], conc_element), ()):
                         if conc_element == agpi[1] and dpi[2] == agpi[0]:
                             dp = {"AGPI": agpi, "DPI": dpi, "ICD": icd}
-                            logger.debug("Visitor DP in: %s" % str(dp))
+                            logger.debug("Visitor DP in: %s" % str(self.get_names(dp)))
                             visitor_dp.append(dp)
         if len(visitor_dp):
-            logger.info("Visitor design pattern has been detected: %s" % visitor_dp)
+            logger.info("Visitor design pattern has been detected: %s" % self.get_names(visitor_dp))
         else:
             logger.warning("Couldn't find any Visitor pattern in the code")
         return visitor_dp
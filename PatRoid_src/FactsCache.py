@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+import time
+import pickle
+import hashlib
+import sqlite3
+
+#################
+# Local Imports #
+#################
+
+from ADPDException import ADPDException
+from FileFacts import FACTS_VERSION
+
+#############
+# CONSTANTS #
+#############
+
+CACHE_DIR_NAME = ".PatRoid_cache"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), CACHE_DIR_NAME)
+DEFAULT_CACHE_SIZE_MB = 512
+CACHE_FILE_NAME = "facts_cache.db"
+# When the cache exceeds its size limit, the least recently used entries are evicted down to this ratio of the limit
+EVICTION_RATIO = 0.9
+
+
+class FactsCache(object):
+    """
+    This class is an on-disk (SQLite) cache for the java files facts,
+    the facts are keyed by a hash of the file content, so unchanged files are not parsed again between runs
+    """
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_CACHE_SIZE_MB):
+        """
+        Constructor
+        :param cache_dir: Directory to keep the cache database in
+        :param max_size_mb: Maximum size of the cached facts in MB
+        """
+        if cache_dir is None:
+            cache_dir = DEFAULT_CACHE_DIR
+        self.cache_file = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.max_size = max_size_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.used_hashes = list()
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            self.connection = sqlite3.connect(self.cache_file, timeout=30)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS facts (hash TEXT PRIMARY KEY, facts BLOB, "
+                                    "size INTEGER, last_used REAL)")
+            self.connection.commit()
+        except Exception as exp:
+            raise ADPDException("Couldn't open the facts cache %s: %s" % (self.cache_file, exp))
+
+    @staticmethod
+    def get_content_hash(content):
+        """
+        This method hashes the given file content together with the facts version,
+        so a change in the facts extraction invalidates the old entries
+        :param content: java file content
+        :return: hex digest
+        """
+        if not isinstance(content, bytes):
+            content = content.encode("utf-8")
+        content_hash = hashlib.sha1(("%s:" % FACTS_VERSION).encode("utf-8"))
+        content_hash.update(content)
+        return content_hash.hexdigest()
+
+    def get(self, content_hash):
+        """
+        Search the cache for the facts of the given content hash
+        :param content_hash: hash of the file content (check get_content_hash)
+        :return: dictionary of the content facts or None if not cached
+        """
+        row = self.connection.execute("SELECT facts FROM facts WHERE hash = ?", (content_hash, )).fetchone()
+        if row is None:
+            self.misses = self.misses + 1
+            return None
+        self.hits = self.hits + 1
+        self.used_hashes.append(content_hash)
+        return pickle.loads(bytes(row[0]))
+
+    def put(self, content_hash, content_facts):
+        """
+        Add the facts of the given content hash to the cache
+        :param content_hash: hash of the file content (check get_content_hash)
+        :param content_facts: dictionary of the content facts
+        :return: nothing
+        """
+        data = pickle.dumps(content_facts, pickle.HIGHEST_PROTOCOL)
+        self.connection.execute("INSERT OR REPLACE INTO facts (hash, facts, size, last_used) VALUES (?, ?, ?, ?)",
+                                (content_hash, sqlite3.Binary(data), len(data), time.time()))
+
+    def evict(self):
+        """
+        Delete the least recently used entries if the cache exceeds its size limit
+        :return: number of evicted entries
+        """
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM facts").fetchone()[0]
+        if total_size <= self.max_size:
+            return 0
+        evicted = list()
+        for (content_hash, size) in self.connection.execute("SELECT hash, size FROM facts ORDER BY last_used"):
+            if total_size <= self.max_size * EVICTION_RATIO:
+                break
+            evicted.append((content_hash, ))
+            total_size = total_size - size
+        self.connection.executemany("DELETE FROM facts WHERE hash = ?", evicted)
+        return len(evicted)
+
+    def close(self):
+        """
+        Mark the used entries, apply the size limit and write everything to the disk
+        :return: nothing
+        """
+        now = time.time()
+        self.connection.executemany("UPDATE facts SET last_used = ? WHERE hash = ?",
+                                    [(now, content_hash) for content_hash in self.used_hashes])
+        self.used_hashes = list()
+        self.evict()
+        self.connection.commit()
+        self.connection.close()
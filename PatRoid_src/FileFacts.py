@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+
+#############
+# CONSTANTS #
+#############
+
+# Increase this version whenever the facts extraction changes, it invalidates the cached facts
+FACTS_VERSION = 2
+
+
+class FileFacts(object):
+    """
+    This class holds all the facts extracted from a single java file,
+    it is built once per file and then shared by all the relations builders
+    """
+    def __init__(self, file_path, class_name, classes_and_parents=None, methods=None, attributes=None,
+                 static_calls=None, fallback_reason=None):
+        """
+        Constructor
+        :param file_path: Java file path
+        :param class_name: The class name (taken from the file name)
+        :param classes_and_parents: dictionary {class_name: parent}
+        :param methods: list of methods signatures dictionaries (access_modifier, return_type, name, arguments)
+        :param attributes: list of tuples [(final_field, data_type, name), ...]
+        :param static_calls: list of classes or objects called a static method
+        :param fallback_reason: Why the file exceeded its parse budget, None if it was parsed fully,
+        otherwise only the classes and the methods signatures are extracted (check ParseBudget)
+        """
+        self.file_path = file_path
+        self.class_name = class_name
+        self.classes_and_parents = classes_and_parents if classes_and_parents is not None else dict()
+        self.methods = methods if methods is not None else list()
+        self.attributes = attributes if attributes is not None else list()
+        self.static_calls = static_calls if static_calls is not None else list()
+        self.fallback_reason = fallback_reason
+
+    def get_methods_specific_info(self, info):
+        """
+        This method prepare a list of specific info from all methods in the file
+        :param info: name, arguments, return_type, etc.
+        :return: List
+        """
+        return [method.get(info) for method in self.methods]
+
+    def get_attributes_types(self, only_final=False):
+        """
+        This method prepare a list of the data types of the attributes defined in the file
+        :param only_final: Include only final attributes
+        :return: List
+        """
+        list_of_data_types = list()
+        for (final_field, data_type, _) in self.attributes:
+            if only_final and final_field == "final":
+                list_of_data_types.append(data_type)
+            elif not only_final and final_field != "final":
+                list_of_data_types.append(data_type)
+        return list_of_data_types
+
+    def get_content_facts(self):
+        """
+        This method returns the facts that depend only on the file content (not on its path)
+        :return: dictionary that can be passed as keyword arguments to the constructor
+        """
+        return {"classes_and_parents": self.classes_and_parents, "methods": self.methods,
+                "attributes": self.attributes, "static_calls": self.static_calls}
@@ -5,12 +5,21 @@
 ##################
 
 import os
+import fnmatch
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
 
 #################
 # Local Imports #
 #################
 
 from Common import CommonMethods
+from ProjectArchive import ProjectArchive
 
 #############
 # CONSTANTS #
@@ -18,68 +27,198 @@ from Common import CommonMethods
 
 MANIFEST_FILE_NAME = "AndroidManifest.xml"
 AUTOMATICALLY_GENERATED_FILE_CONTENT = "Automatically generated file. DO NOT MODIFY"
+AUTOMATICALLY_GENERATED_HEADER_SIZE = 4096
+EXCLUDED_DIRECTORIES = ["build", ".gradle", ".git", "generated"]
+SOURCE_SETS_DIRECTORY = "src"
+MAIN_SOURCE_SET = "main"
 
 
 class GetManiAndJava(object):
     """
         The first class to call in this project
         This class aims to collect all the java files
-        and the manifest xml file
+        and the manifest xml file,
+        the project directory is walked once (with scandir when available) to find both of them,
+        the build outputs directories (EXCLUDED_DIRECTORIES, outside the source sets) and the paths matching the
+        exclude globs are skipped (check skipped_paths),
+        only the header of each java file is read, it is kept so the parsing doesn't read it again,
+        the project can also be a zip (or tar.gz) archive, its members are walked without extracting it,
+        all the manifests are kept to find the project modules (check get_project_modules)
     """
-    def __init__(self, android_project_path):
+    def __init__(self, android_project_path, exclude=None):
         """
         Constructor of class
+        :param android_project_path: The project directory or archive
+        :param exclude: List of globs of the files and directories to skip, a glob is matched against the name
+        and against the path relative to the project directory
         """
         self.project_path = android_project_path
+        self.exclude = list(exclude) if exclude else list()
+        self.scanned_paths = dict()
+        self.files_headers = dict()
+        self.skipped_paths = list()
+        self.archive = None
+        if ProjectArchive.is_archive(android_project_path):
+            self.archive = ProjectArchive.open_archive(android_project_path)
+
+    def is_excluded(self, name, full_path, is_directory):
+        """
+        This method checks if the given file or directory should be skipped, the EXCLUDED_DIRECTORIES names are
+        skipped only outside the source sets directories, so a java package with one of these names is kept
+        (e.g. src/main/java/com/example/build)
+        :param name: file or directory name
+        :param full_path: full path of the file or directory
+        :param is_directory: True for directories
+        :return: True if it should be skipped
+        """
+        relative_path = os.path.relpath(full_path, self.project_path).replace(os.sep, "/")
+        if is_directory and name in EXCLUDED_DIRECTORIES and \
+                SOURCE_SETS_DIRECTORY not in relative_path.split("/")[:-1]:
+            return True
+        for glob in self.exclude:
+            if fnmatch.fnmatch(name, glob) or fnmatch.fnmatch(relative_path, glob):
+                return True
+        return False
+
+    def list_directory(self, directory):
+        """
+        This method lists the given directory, the file type comes with the entries when scandir is available
+        :param directory: directory path
+        :return: list of tuples [(name, full_path, is_directory), ...] in the directory order
+        """
+        if self.archive is not None:
+            return self.archive.list_directory(directory)
+        if scandir is not None:
+            return [(entry.name, entry.path, entry.is_dir()) for entry in scandir(directory)]
+        entries = list()
+        for file_name in os.listdir(directory):
+            full_file_path = os.path.join(directory, file_name)
+            entries.append((file_name, full_file_path, os.path.isdir(full_file_path)))
+        return entries
+
+    def scan_directory(self, directory, java_files, manifests):
+        """
+        This method walks the given directory recursively, it collects the java files and the manifests
+        (in the walk order) and finds the manifest file, a manifest directly under a directory is chosen before
+        the ones under its sub directories, and the sub directories are checked in the walk order
+        :param directory: directory path
+        :param java_files: list to add the found java files to
+        :param manifests: list to add the found manifests files to
+        :return: full path of the manifest file, None if not found
+        """
+        manifest_file = None
+        sub_directories_manifest = None
+        for (file_name, full_file_path, is_directory) in self.list_directory(directory):
+            if self.is_excluded(file_name, full_file_path, is_directory):
+                self.skipped_paths.append(full_file_path)
+                continue
+            if is_directory:
+                found_manifest = self.scan_directory(full_file_path, java_files, manifests)
+                if sub_directories_manifest is None:
+                    sub_directories_manifest = found_manifest
+            elif MANIFEST_FILE_NAME == file_name:
+                manifests.append(full_file_path)
+                if manifest_file is None:
+                    manifest_file = full_file_path
+            elif "R.java" != file_name and file_name.endswith(".java"):
+                if not self.__is_auto_generated(full_file_path):
+                    java_files.append(full_file_path)
+        if manifest_file is None:
+            manifest_file = sub_directories_manifest
+        return manifest_file
+
+    def scan_project(self, root_path=None):
+        """
+        This method walks the project directory (once for each root path) to find the manifest and java files
+        :param root_path: directory to walk, the project directory by default
+        :return: tuple (manifest_file, list_of_java_files, list_of_manifests_files)
+        """
+        if root_path is None:
+            root_path = self.project_path
+        if root_path not in self.scanned_paths:
+            java_files = list()
+            manifests = list()
+            manifest_file = self.scan_directory(root_path, java_files, manifests)
+            self.scanned_paths[root_path] = (manifest_file, java_files, manifests)
+        return self.scanned_paths[root_path]
 
     def get_project_manifest(self, root_path=None):
         """
         This method search for the manifest.xml file inside the project directory
         :return: full path of the manifest file
         """
+        return self.scan_project(root_path)[0]
+
+    def get_module_directory(self, manifest_file):
+        """
+        This method finds the module directory of the given manifest,
+        it is the directory of the source sets (module/src/main/AndroidManifest.xml) or the manifest directory
+        :param manifest_file: full path of the manifest file
+        :return: module directory path
+        """
+        manifest_directory = os.path.dirname(manifest_file)
+        source_sets_directory = os.path.dirname(manifest_directory)
+        if os.path.basename(source_sets_directory) == SOURCE_SETS_DIRECTORY:
+            return os.path.dirname(source_sets_directory)
+        return manifest_directory
+
+    def get_project_modules(self, root_path=None):
+        """
+        This method finds the modules of the project (app, features and libraries), a module is the directory of
+        one or more manifests (one per source set, the main one is chosen), each java file belongs to the deepest
+        module directory it is in
+        :param root_path: directory to walk, the project directory by default
+        :return: list of modules in the walk order [{"name": name, "path": module_directory,
+        "manifest": manifest_file, "java_files": [java_file, ...]}, ...]
+        """
         if root_path is None:
             root_path = self.project_path
-        files_under_root_path = os.listdir(root_path)
-        directories = list()
-        full_manifest_file = None
-        for file_name in files_under_root_path:
-            full_file_path = os.path.join(root_path, file_name)
-            if MANIFEST_FILE_NAME == file_name:
-                full_manifest_file = full_file_path
-                break
-            if os.path.isdir(full_file_path):
-                directories.append(full_file_path)
-        for directory in directories:
-            if full_manifest_file is None:
-                full_manifest_file = self.get_project_manifest(root_path=directory)
-            else:
-                break
-        return full_manifest_file
+        (manifest_file, java_files, manifests) = self.scan_project(root_path)
+        modules = list()
+        modules_by_path = dict()
+        for manifest in manifests:
+            module_path = self.get_module_directory(manifest)
+            if module_path not in modules_by_path:
+                name = os.path.relpath(module_path, root_path).replace(os.sep, "/")
+                if name == ".":
+                    name = os.path.basename(os.path.normpath(root_path))
+                modules_by_path[module_path] = {"name": name, "path": module_path, "manifest": manifest,
+                                                "java_files": list()}
+                modules.append(modules_by_path[module_path])
+            elif os.path.basename(os.path.dirname(manifest)) == MAIN_SOURCE_SET:
+                modules_by_path[module_path]["manifest"] = manifest
+        modules_paths = sorted(modules_by_path.keys(), key=len, reverse=True)
+        for java_file in java_files:
+            for module_path in modules_paths:
+                if java_file.startswith(module_path + os.sep):
+                    modules_by_path[module_path]["java_files"].append(java_file)
+                    break
+        return modules
 
     def __is_auto_generated(self, file_path):
         """
         This is a private method to check if the given file is autogenerated or not
-        autogenerate files are the one contains the pattern: AUTOMATICALLY_GENERATED_FILE_CONTENT
+        autogenerate files are the one contains the pattern: AUTOMATICALLY_GENERATED_FILE_CONTENT in their header
+        (the first AUTOMATICALLY_GENERATED_HEADER_SIZE characters), the header of the other files is kept
         :param file_path: the file to check
         :return: true if it autogenerated and false otherwise
         """
-        file_content = CommonMethods.read_file(file_path)
-        return AUTOMATICALLY_GENERATED_FILE_CONTENT in file_content
+        header = CommonMethods.read_file_header(file_path, AUTOMATICALLY_GENERATED_HEADER_SIZE)
+        if AUTOMATICALLY_GENERATED_FILE_CONTENT in header[0]:
+            return True
+        self.files_headers[file_path] = header
+        return False
+
+    def get_files_headers(self):
+        """
+        Get the headers read from the java files, to be passed to CommonMethods.read_file
+        :return: dictionary {java_file: (header, position after the header or None if it is the whole file)}
+        """
+        return self.files_headers
 
     def get_all_java_files(self, root_path=None):
         """
         This method search for all java files in android project
         :return: list of full paths for all java files
         """
-        list_of_java_files = list()
-        if root_path is None:
-            root_path = self.project_path
-        files_under_root_path = os.listdir(root_path)
-        for file_name in files_under_root_path:
-            full_file_path = os.path.join(root_path, file_name)
-            if os.path.isdir(full_file_path):
-                list_of_java_files.extend(self.get_all_java_files(root_path=full_file_path))
-            if "R.java" != file_name and file_name.endswith(".java"):
-                if not self.__is_auto_generated(full_file_path):
-                    list_of_java_files.append(full_file_path)
-        return list_of_java_files
\ No newline at end of file
+        return list(self.scan_project(root_path)[1])
\ No newline at end of file
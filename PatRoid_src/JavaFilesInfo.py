@@ -5,12 +5,21 @@
 ##################
 
 import re
+import functools
+import multiprocessing
 
 #################
 # Local Imports #
 #################
 
 from ADPDException import ADPDException
+from ClassNamesScanner import ClassNamesScanner
+from Common import CommonMethods
+from FileFacts import FileFacts
+from ParseBudget import ParseBudget, ParseBudgetExceeded
+from RegexRegistry import RegexRegistry
+from RelationsStore import RelationsStore
+from SymbolTable import SymbolTable
 from regex_handler import RegexHandler
 
 #############
@@ -18,6 +27,40 @@ from regex_handler import RegexHandler
 #############
 
 DATA_TYPES_KEYWORDS = ['String', 'char', 'int', 'double', 'float', 'boolean', 'bool']
+FILES_PER_JOB_CHUNK = 16
+METHOD_FIELDS = ["access_modifier", "return_type", "name", "arguments", "body"]
+METHOD_SIGNATURE_FIELDS = ["access_modifier", "return_type", "name", "arguments"]
+
+
+def extract_file_facts(java_file_and_content, parse_budget=None):
+    """
+    Module level wrapper for JavaFilesInfo.get_file_facts, so it can be sent to the pool worker processes
+    :param java_file_and_content: tuple of (Java file path, its content or None to read it, its header or None)
+    :param parse_budget: ParseBudget of each file (default budget if not given)
+    :return: FileFacts object
+    """
+    (java_file, content, header) = java_file_and_content
+    return JavaFilesInfo.get_file_facts(java_file, content=content, header=header, parse_budget=parse_budget)
+
+
+def reset_worker_counters():
+    """
+    Pool worker processes initializer, a forked worker starts with a copy of the main process regex counters,
+    they are dropped so they aren't merged twice
+    :return: nothing
+    """
+    RegexRegistry.pop_counters()
+
+
+def extract_file_facts_and_counters(java_file_and_content, parse_budget=None):
+    """
+    Module level wrapper for extract_file_facts in the pool worker processes,
+    it returns the regex counters of the worker too, so they are merged in the main process (check RegexRegistry)
+    :param java_file_and_content: tuple of (Java file path, its content or None to read it, its header or None)
+    :param parse_budget: ParseBudget of each file (default budget if not given)
+    :return: tuple of (FileFacts object, regex counters)
+    """
+    return extract_file_facts(java_file_and_content, parse_budget=parse_budget), RegexRegistry.pop_counters()
 
 
 class JavaFilesInfo(object):
@@ -54,41 +97,168 @@ class JavaFilesInfo(object):
         return results
 
     @staticmethod
-    def create_methods_dictionary(file_path):
+    def create_methods_dictionary(file_path, content=None, parse_budget=None, signatures_only=False, fields=None):
         """
         This method takes a java file name and return a dicionary of the methods it contains
         :param file_path: Java File path
+        :param content: The file content if it was already read
+        :param parse_budget: ParseBudget of the file, its time budget is checked while scanning (None for no budget)
+        :param signatures_only: Extract only the methods signatures (the body of each method is None)
+        :param fields: The methods fields the caller needs (default: METHOD_FIELDS), only they are put in the
+        dictionaries, the body is the (start, end) offsets of the method body in the file content
         :return: List of dictionaries of the file methods
         """
+        if fields is None:
+            fields = METHOD_FIELDS
         methods_list = list()
         method_handler = RegexHandler()
-        methods = method_handler.apply_methods_regex(file_path=file_path)
+        if signatures_only:
+            methods = method_handler.apply_methods_signatures_regex(file_path=file_path, string=content)
+        else:
+            methods = method_handler.apply_methods_regex(file_path=file_path, string=content,
+                                                         parse_budget=parse_budget)
         for (access_modifier, return_type, name, arguments, body) in methods:
             method_dict = dict()
-            method_dict["access_modifier"] = access_modifier
-            method_dict["return_type"] = return_type
-            method_dict["name"] = name
-            method_dict["arguments"] = JavaFilesInfo.get_method_arguments(arguments)
-            method_dict["body"] = body
+            if "access_modifier" in fields:
+                method_dict["access_modifier"] = access_modifier
+            if "return_type" in fields:
+                method_dict["return_type"] = return_type
+            if "name" in fields:
+                method_dict["name"] = name
+            if "arguments" in fields:
+                method_dict["arguments"] = JavaFilesInfo.get_method_arguments(arguments)
+            if "body" in fields:
+                method_dict["body"] = body
             methods_list.append(method_dict)
         return methods_list
 
     @staticmethod
-    def get_list_of_classes_names_and_parents(java_files):
+    def get_classes_and_parents(content):
+        """
+        This method extracts the classes defined in the given java source and their parents
+        :param content: The file content
+        :return: dictionary {class_name: parent}
+        """
+        return dict(RegexHandler().apply_classes_headers_scanner(string=content))
+
+    @staticmethod
+    def get_file_facts(java_file, content=None, header=None, parse_budget=None):
+        """
+        This method reads the given java file once and extracts all the facts needed by the relations builders,
+        a file that exceeds the parse budget is handled by the fallback extractor (check get_fallback_file_facts)
+        :param java_file: Java file path
+        :param content: The file content if it was already read
+        :param header: The file header if it was already read (check CommonMethods.read_file_header)
+        :param parse_budget: ParseBudget of the file (default budget if not given)
+        :return: FileFacts object
+        """
+        regex_handler = RegexHandler()
+        if content is None:
+            content = CommonMethods.read_file(java_file, header=header)
+        if parse_budget is None:
+            parse_budget = ParseBudget()
+        class_name = regex_handler.apply_class_name_from_path_regex(string=java_file)[0]
+        try:
+            parse_budget.start(content)
+            methods = JavaFilesInfo.create_methods_dictionary(java_file, content=content, parse_budget=parse_budget,
+                                                              fields=METHOD_SIGNATURE_FIELDS)
+            parse_budget.check()
+            (classes_headers, attributes, static_calls) = regex_handler.apply_tokens_scanner(string=content)
+            classes_and_parents = dict(classes_headers)
+        except ParseBudgetExceeded as exp:
+            file_facts = JavaFilesInfo.get_fallback_file_facts(java_file, class_name, content)
+            file_facts.fallback_reason = "%s (%.3f seconds)" % (exp, parse_budget.get_elapsed_seconds())
+            return file_facts
+        return FileFacts(java_file, class_name, classes_and_parents=classes_and_parents, methods=methods,
+                         attributes=attributes, static_calls=static_calls)
+
+    @staticmethod
+    def get_fallback_file_facts(java_file, class_name, content):
+        """
+        This method is the cheap fallback of get_file_facts for the files that exceed the parse budget,
+        it extracts only the classes and the methods signatures, with no bodies, attributes nor static calls
+        :param java_file: Java file path
+        :param class_name: The class name (taken from the file name)
+        :param content: The file content
+        :return: FileFacts object
+        """
+        methods = JavaFilesInfo.create_methods_dictionary(java_file, content=content, signatures_only=True,
+                                                          fields=METHOD_SIGNATURE_FIELDS)
+        return FileFacts(java_file, class_name, classes_and_parents=JavaFilesInfo.get_classes_and_parents(content),
+                         methods=methods)
+
+    @staticmethod
+    def parse_files(files_to_parse, jobs=1, parse_budget=None):
+        """
+        This method extracts the facts of the given files, in a pool of processes if more than one job is requested
+        :param files_to_parse: List of tuples [(java_file, content or None, header or None), ...]
+        :param jobs: Number of processes to parse the files in, zero means all the cpu cores
+        :param parse_budget: ParseBudget of each file (default budget if not given)
+        :return: List of FileFacts objects in the same order of files_to_parse
         """
-        It return a dictionary of java classes names  and their parents in the given java files
+        if jobs == 0:
+            jobs = multiprocessing.cpu_count()
+        jobs = min(jobs, len(files_to_parse))
+        if jobs <= 1:
+            return [extract_file_facts(file_to_parse, parse_budget=parse_budget) for file_to_parse in files_to_parse]
+        chunk_size = max(1, min(FILES_PER_JOB_CHUNK, len(files_to_parse) // (jobs * 4)))
+        pool = multiprocessing.Pool(processes=jobs, initializer=reset_worker_counters)
+        try:
+            # map keeps the order of the java files, so the output is the same as the serial run
+            extract = functools.partial(extract_file_facts_and_counters, parse_budget=parse_budget)
+            files_facts_and_counters = pool.map(extract, files_to_parse, chunk_size)
+            pool.close()
+        except Exception:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        files_facts = list()
+        for (file_facts, counters) in files_facts_and_counters:
+            RegexRegistry.merge_counters(counters)
+            files_facts.append(file_facts)
+        return files_facts
+
+    @staticmethod
+    def get_files_facts(java_files, jobs=1, cache=None, files_headers=None, parse_budget=None):
+        """
+        This method prepare the facts of all the given java files, each file is read only once
         :param java_files: List of .java files
-        :return: List of [{class_name: parent}, {...}, ...]
+        :param jobs: Number of processes to parse the files in, zero means all the cpu cores
+        :param cache: FactsCache object, only the files that are not in the cache are parsed
+        :param files_headers: dictionary of the already read files headers (check GetManiAndJava.get_files_headers)
+        :param parse_budget: ParseBudget of each file (default budget if not given), the facts of the files that
+        exceed it are not cached
+        :return: List of FileFacts objects in the same order of java_files
         """
-        class_list = list()
+        if files_headers is None:
+            files_headers = dict()
+        if cache is None:
+            return JavaFilesInfo.parse_files([(java_file, None, files_headers.get(java_file))
+                                              for java_file in java_files], jobs=jobs, parse_budget=parse_budget)
         regex_handler = RegexHandler()
+        files_facts = list()
+        files_to_parse = list()
+        missed_indexes = list()
+        missed_hashes = list()
         for java_file in java_files:
-            class_and_parent = regex_handler.apply_class_name_and_parent_regex(file_path=java_file)
-            classes_dict = dict()
-            for (class_name, class_parent)in class_and_parent:
-                classes_dict[class_name] = class_parent
-            class_list.append(classes_dict)
-        return class_list
+            content = CommonMethods.read_file(java_file, header=files_headers.get(java_file))
+            content_hash = cache.get_content_hash(content)
+            content_facts = cache.get(content_hash)
+            if content_facts is None:
+                missed_indexes.append(len(files_facts))
+                missed_hashes.append(content_hash)
+                files_to_parse.append((java_file, content, None))
+                files_facts.append(None)
+            else:
+                class_name = regex_handler.apply_class_name_from_path_regex(string=java_file)[0]
+                files_facts.append(FileFacts(java_file, class_name, **content_facts))
+        parsed_files_facts = JavaFilesInfo.parse_files(files_to_parse, jobs=jobs, parse_budget=parse_budget)
+        for (index, content_hash, file_facts) in zip(missed_indexes, missed_hashes, parsed_files_facts):
+            if file_facts.fallback_reason is None:
+                cache.put(content_hash, file_facts.get_content_facts())
+            files_facts[index] = file_facts
+        return files_facts
 
     @staticmethod
     def get_list_of_classes_names(java_files):
@@ -105,164 +275,116 @@ class JavaFilesInfo(object):
         return classes
 
     @staticmethod
-    def get_inherentance_relations(java_files):
+    def get_inherentance_relations(java_files, files_facts=None, symbol_table=None):
         """
         It return a dictionary with class and its parent from this project
         :param java_files: List of .java files
-        :return: List of [{class_name: parent}, {...}, ...]
+        :param files_facts: List of FileFacts for the java_files (extracted if not given)
+        :param symbol_table: SymbolTable of the java_files classes names (built if not given)
+        :return: RelationsStore of (parent, class_name) relations
         """
-        class_list = list()
-        classes = JavaFilesInfo.get_list_of_classes_names(java_files)
-        classes_and_parents = JavaFilesInfo.get_list_of_classes_names_and_parents(java_files)
+        if symbol_table is None:
+            symbol_table = SymbolTable(JavaFilesInfo.get_list_of_classes_names(java_files))
+        relations_store = RelationsStore(symbol_table)
+        if files_facts is None:
+            files_facts = JavaFilesInfo.get_files_facts(java_files)
+        classes_and_parents = [file_facts.classes_and_parents for file_facts in files_facts]
         for class_and_parent in classes_and_parents:
             for key, val in class_and_parent.iteritems():
-                if val in classes:
-                    inheritance_relation = dict()
-                    inheritance_relation[key] = val
-                    class_list.append(inheritance_relation)
-        return class_list
-
-    @staticmethod
-    def get_methods_specific_info(java_file, info):
-        """
-        This method prepare a list of specific info from all methods in class
-        :param java_file: Class
-        :param info: name, arguments, data_type, etc. (check create_methods_dictionary)
-        :return: List
-        """
-        list_of_info = list()
-        java_methods = JavaFilesInfo.create_methods_dictionary(java_file)
-        for method in java_methods:
-            list_of_info.append(method.get(info))
-        return list_of_info
+                if val in symbol_table:
+                    relations_store.add_relation(val, key)
+        return relations_store.sort()
 
     @staticmethod
-    def get_attributes_types(java_file, only_final=False):
+    def get_types_relations(files_facts, files_types, symbol_table, classes_scanner=None):
         """
-        This method prepare a list of specific info from all attributes defined in the given class
-        :param java_file: Class
-        :param only_final: Include only final attributes
-        :return: List
+        It finds the (ci, cj) relations where the file of class ci uses the type of class cj,
+        the inverted index of the classes scanner gives the files that mention each class,
+        so only those files are looked up for the relations to that class
+        :param files_facts: List of FileFacts
+        :param files_types: List of the sets of the types names used in each of the files_facts
+        :param symbol_table: SymbolTable of the classes names
+        :param classes_scanner: ClassNamesScanner of the classes names (a new one is used if not given)
+        :return: RelationsStore of (ci, cj) relations
         """
-        list_of_data_types = list()
-        regex_handler = RegexHandler()
-        attributes = regex_handler.apply_object_definition_regex(file_path=java_file)
-        for (final_field, data_type, _) in attributes:
-            if only_final and final_field == "final":
-                list_of_data_types.append(data_type)
-            elif not only_final and final_field != "final":
-                list_of_data_types.append(data_type)
-        return list_of_data_types
-
-    @staticmethod
-    def __create_relation(java_file, data_type):
-        """
-        This private method prepare dictionary of classi and classj which have a relation
-        :param java_file: class
-        :param data_type: object data type or a return data type
-        :return: dictionary
-        """
-        relation = dict()
-        regex_handler = RegexHandler()
-        class_name = regex_handler.apply_class_name_from_path_regex(string=java_file)[0]
-        relation[data_type] = class_name
-        return relation
+        relations_store = RelationsStore(symbol_table)
+        if classes_scanner is None:
+            classes_scanner = ClassNamesScanner([symbol_table.get_name(class_id)
+                                                 for class_id in range(1, symbol_table.classes_count + 1)])
+        files_indexes = dict()
+        for (index, file_facts) in enumerate(files_facts):
+            files_indexes[file_facts.file_path] = index
+        classes_scanner.scan_files([file_facts.file_path for file_facts in files_facts])
+        for class_id in range(1, symbol_table.classes_count + 1):
+            class_name = symbol_table.get_name(class_id)
+            for java_file in classes_scanner.get_files_mentioning(class_name):
+                index = files_indexes.get(java_file)
+                if index is not None and class_name in files_types[index]:
+                    relations_store.add_relation(files_facts[index].class_name, class_name)
+        return relations_store.sort()
 
     @staticmethod
-    def get_association_relations(java_files):
+    def get_association_relations(java_files, files_facts=None, symbol_table=None, classes_scanner=None):
         """
         It return a dictionary with classes that have association relation
         :param java_files: List of .java files
-        :return: List of [{ci: cj}, {...}, ...], where class ci has an attribute that is a type of class cj,
+        :param files_facts: List of FileFacts for the java_files (extracted if not given)
+        :param symbol_table: SymbolTable of the java_files classes names (built if not given)
+        :param classes_scanner: ClassNamesScanner of the java_files classes names (a new one is used if not given)
+        :return: RelationsStore of (ci, cj) relations, where class ci has an attribute that is a type of class cj,
         or class ci has a method which returns a cj object.
         """
-        class_list = list()
-        classes = JavaFilesInfo.get_list_of_classes_names(java_files)
-        for java_file in java_files:
-            methods_return_types = JavaFilesInfo.get_methods_specific_info(java_file, "return_type")
-            attributes_types = JavaFilesInfo.get_attributes_types(java_file)
-            for data_type in methods_return_types + attributes_types:
-                if data_type in classes:
-                    relation = JavaFilesInfo.__create_relation(java_file, data_type)
-                    if relation not in class_list:
-                        class_list.append(relation)
-        return class_list
+        if symbol_table is None:
+            symbol_table = SymbolTable(JavaFilesInfo.get_list_of_classes_names(java_files))
+        if files_facts is None:
+            files_facts = JavaFilesInfo.get_files_facts(java_files)
+        files_types = [set(file_facts.get_methods_specific_info("return_type") + file_facts.get_attributes_types())
+                       for file_facts in files_facts]
+        return JavaFilesInfo.get_types_relations(files_facts, files_types, symbol_table,
+                                                 classes_scanner=classes_scanner)
 
     @staticmethod
-    def get_aggregation_relations(java_files):
+    def get_aggregation_relations(java_files, files_facts=None, symbol_table=None, classes_scanner=None):
         """
         It return a dictionary with classes that have aggregation relation
         :param java_files: List of .java files
-        :return: List of [{ci: cj}, {...}, ...], where class ci has an attribute that is a type of class cj.
+        :param files_facts: List of FileFacts for the java_files (extracted if not given)
+        :param symbol_table: SymbolTable of the java_files classes names (built if not given)
+        :param classes_scanner: ClassNamesScanner of the java_files classes names (a new one is used if not given)
+        :return: RelationsStore of (ci, cj) relations, where class ci has an attribute that is a type of class cj.
         The aggregation is considered as a special kind of association relationship,
         in which class ci is the whole class and class cj is the partial class.
         """
-        class_list = list()
-        classes = JavaFilesInfo.get_list_of_classes_names(java_files)
-        for java_file in java_files:
-            attributes_types = JavaFilesInfo.get_attributes_types(java_file, only_final=True)
-            for data_type in attributes_types:
-                if data_type in classes:
-                    relation = JavaFilesInfo.__create_relation(java_file, data_type)
-                    if relation not in class_list:
-                        class_list.append(relation)
-        return class_list
+        if symbol_table is None:
+            symbol_table = SymbolTable(JavaFilesInfo.get_list_of_classes_names(java_files))
+        if files_facts is None:
+            files_facts = JavaFilesInfo.get_files_facts(java_files)
+        files_types = [set(file_facts.get_attributes_types(only_final=True)) for file_facts in files_facts]
+        return JavaFilesInfo.get_types_relations(files_facts, files_types, symbol_table,
+                                                 classes_scanner=classes_scanner)
 
     @staticmethod
-    def get_depends_relations_from_methods_args(java_file, methods_args, classes):
-        """
-        This method search in method args for objects to add a depends relation
-        :param java_file: Java class
-        :param methods_args: All methods arguments in class
-        :return: list of dictionaries[{ci:cj}, ..]
-        """
-        class_list = list()
-        if methods_args:
-            for method_args in methods_args:
-                if method_args:
-                    for arg in method_args:
-                        data_type = arg.keys()[0]
-                        if data_type in classes:
-                            relation = JavaFilesInfo.__create_relation(java_file, data_type)
-                            if relation not in class_list:
-                                class_list.append(relation)
-        return class_list
-
-    @staticmethod
-    def get_static_method_calls(java_file, classes=None):
-        """
-        Apply static method call pattern and return a list of all classes called a static method
-        :param java_file: Java class
-        :return: list of classes and object called a method
-        """
-        list_of_classes_or_objects = list()
-        regex_handler = RegexHandler()
-        objects_or_classes = regex_handler.apply_static_method_call_regex(file_path=java_file)
-        if classes:
-            for class_name in objects_or_classes:
-                if class_name in classes:
-                    list_of_classes_or_objects.append(class_name)
-        else:
-            list_of_classes_or_objects = objects_or_classes
-        return list_of_classes_or_objects
-
-    @staticmethod
-    def get_depends_relations(java_files):
+    def get_depends_relations(java_files, files_facts=None, symbol_table=None, classes_scanner=None):
         """
         It return a dictionary with classes that have depends relation
         :param java_files: List of .java files
-        :return: List of [{ci: cj}, {...}, ...], where:
+        :param files_facts: List of FileFacts for the java_files (extracted if not given)
+        :param symbol_table: SymbolTable of the java_files classes names (built if not given)
+        :param classes_scanner: ClassNamesScanner of the java_files classes names (a new one is used if not given)
+        :return: RelationsStore of (ci, cj) relations, where:
         (i) The instance of class ci calls a static method in class cj
         (ii) An instance of class cj is used as the parameter passed to a method in class ci
         """
-        class_list = list()
-        classes = JavaFilesInfo.get_list_of_classes_names(java_files)
-        for java_file in java_files:
-            static_method_call = JavaFilesInfo.get_static_method_calls(java_file, classes=classes)
-            for class_name in static_method_call:
-                relation = JavaFilesInfo.__create_relation(java_file, class_name)
-                if relation not in class_list:
-                    class_list.append(relation)
-            methods_args = JavaFilesInfo.get_methods_specific_info(java_file, "arguments")
-            class_list.extend(JavaFilesInfo.get_depends_relations_from_methods_args(java_file, methods_args, classes))
-        return class_list
+        if symbol_table is None:
+            symbol_table = SymbolTable(JavaFilesInfo.get_list_of_classes_names(java_files))
+        if files_facts is None:
+            files_facts = JavaFilesInfo.get_files_facts(java_files)
+        files_types = list()
+        for file_facts in files_facts:
+            data_types = set(file_facts.static_calls)
+            for method_args in file_facts.get_methods_specific_info("arguments"):
+                for arg in method_args or list():
+                    data_types.add(arg.keys()[0])
+            files_types.append(data_types)
+        return JavaFilesInfo.get_types_relations(files_facts, files_types, symbol_table,
+                                                 classes_scanner=classes_scanner)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import re
+import time
+
+#################
+# Local Imports #
+#################
+
+from RegexRegistry import RegexRegistry
+
+#############
+# CONSTANTS #
+#############
+
+COMMENTS_AND_LITERALS_REGEX = r'//[^\n]*|/\*.*?(?:\*/|\Z)|"""(?:.*?""")?|"(?:\\.|[^"\\\n])*"?|' \
+                              r"'(?:\\.|[^'\\\n])*'?"
+BLANKED_CHARS_REGEX = r"[^\r\n]"
+
+
+class JavaLexer(object):
+    """
+    This class is the lexer stage that runs before the regex extraction (check RegexHandler),
+    it walks the java source once and blanks the comments (with the javadoc) and the content of the strings and
+    chars literals, everything is replaced by spaces except the line breaks and the literals quotes,
+    so the offsets of the code stay the same and the regex don't match anything inside them
+    """
+    comments_and_literals_pattern = RegexRegistry.register("COMMENTS_AND_LITERALS_REGEX", COMMENTS_AND_LITERALS_REGEX,
+                                                           re.DOTALL)
+    blanked_chars_pattern = RegexRegistry.register("BLANKED_CHARS_REGEX", BLANKED_CHARS_REGEX)
+
+    def __init__(self, text):
+        """
+        Constructor
+        :param text: The java source
+        """
+        self.text = text
+
+    def blank_token(self, token_match):
+        """
+        This method blanks the given comment or literal
+        :param token_match: re match object of the comment or the literal
+        :return: the blanked token, with the same length
+        """
+        token = token_match.group(0)
+        if token.startswith("/"):
+            return JavaLexer.blanked_chars_pattern.sub(" ", token)
+        quote = token[0] * 3 if token.startswith('"""') else token[0]
+        if len(token) >= 2 * len(quote) and token.endswith(quote):
+            return quote + JavaLexer.blanked_chars_pattern.sub(" ", token[len(quote):-len(quote)]) + quote
+        return quote + JavaLexer.blanked_chars_pattern.sub(" ", token[len(quote):])
+
+    def blank_comments_and_literals(self):
+        """
+        This method blanks all the comments and the literals of the text in a single pass
+        :return: the text without comments and literals content, with the same length
+        """
+        start_time = time.time()
+        (text, tokens_count) = JavaLexer.comments_and_literals_pattern.subn(self.blank_token, self.text)
+        RegexRegistry.add_counters("COMMENTS_AND_LITERALS_REGEX", len(self.text), tokens_count,
+                                   time.time() - start_time)
+        return text
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+from JavaTokensScanner import JavaTokensScanner
+
+#############
+# CONSTANTS #
+#############
+
+METHODS_MODIFIERS = frozenset(["public", "private", "protected", "static", "final", "abstract", "synchronized",
+                               "volatile"])
+# the single characters tokens of the arguments list, besides the words and the spaces
+ARGUMENTS_TOKENS = frozenset(["|", ",", "@", "_"])
+
+
+class JavaMethodsScanner(object):
+    """
+    This class extracts the methods from the tokens of a java source (after the lexer stage, check JavaLexer),
+    the tokens are the ones of JavaTokensScanner, so the source is tokenized once for all the extractors,
+    the braces are the "{" and "}" tokens, each method signature is matched backwards from the "{" of its body,
+    and the braces pairs are used to find where each method body ends, so the cost stays linear in the size of
+    the source, the bodies are given by their offsets in the text, they are not copied out of it
+    """
+    def __init__(self, text, parse_budget=None, tokens_scanner=None):
+        """
+        Constructor
+        :param text: The java source to scan
+        :param parse_budget: ParseBudget of the file, its time budget is checked while scanning (None for no budget)
+        :param tokens_scanner: JavaTokensScanner of the text (a new one is used if not given)
+        """
+        self.text = text
+        self.parse_budget = parse_budget
+        self.tokens_scanner = tokens_scanner if tokens_scanner is not None else JavaTokensScanner(text)
+        self.braces = list()
+        self.braces_tokens = list()
+        self.braces_indexes = dict()
+        self.closing_braces = dict()
+        self.unclosed_braces = set()
+
+    def find_braces(self):
+        """
+        This method collects the braces tokens, their offsets in the text, and the closing brace of every opening
+        one (the comments and the literals are blanked by the lexer, so they have no braces)
+        :return: nothing, it sets the braces, braces_tokens, braces_indexes and closing_braces attributes
+        """
+        tokens_scanner = self.tokens_scanner
+        self.braces_tokens = sorted(list(tokens_scanner.find_tokens("{")) + list(tokens_scanner.find_tokens("}")))
+        self.braces = tokens_scanner.get_offsets(self.braces_tokens)
+        opened = list()
+        for (brace, index) in enumerate(self.braces):
+            self.braces_indexes[index] = brace
+            if self.text[index] == "{":
+                opened.append(index)
+            elif opened:
+                self.closing_braces[opened.pop()] = index
+
+    def match_signature(self, body_token, position=0):
+        """
+        This method matches the method signature that ends at the given "{" token, the replaced regex is:
+        (?<!\\w)((?:(?:public|private|protected|static|final|abstract|synchronized|volatile)\\s+)*)\\s*(\\w+)\\s+
+        (\\w+)\\(([\\w|\\s|,|@]*)\\)\\s*{ (not starting inside a spaces run), the signature can start at any of the
+        modifiers before the return type, or at the spaces before it when there is no modifier, as the regex
+        search does it starts at the first of them from the given token
+        :param body_token: index of the "{" token
+        :param position: index of the first token the signature can start at
+        :return: tuple (access_modifier, return_type, name, arguments), None if it doesn't match
+        """
+        tokens_scanner = self.tokens_scanner
+        tokens = tokens_scanner.tokens
+        index = body_token - 1
+        if index >= 0 and tokens[index][0].isspace():
+            index = index - 1
+        if index < 0 or tokens[index] != ")":
+            return None
+        arguments_end = index
+        index = index - 1
+        # the tokens are walked directly (not by get_token) since every "{" of the source is tried
+        while index >= 0 and tokens[index] != "(":
+            token = tokens[index]
+            if len(token) == 1 and token not in ARGUMENTS_TOKENS and not token.isalnum() and not token.isspace():
+                return None
+            index = index - 1
+        name = index - 1
+        return_type = index - 3
+        if return_type < position or not tokens_scanner.is_word(tokens[name]) or \
+                not tokens_scanner.is_space(tokens[name - 1]) or not tokens_scanner.is_word(tokens[return_type]):
+            return None
+        start = return_type
+        while start - 2 >= position and tokens[start - 1][0].isspace() and tokens[start - 2] in METHODS_MODIFIERS:
+            start = start - 2
+        access_modifier = ""
+        if start < return_type:
+            access_modifier = "".join(tokens[start:return_type])
+        return access_modifier, tokens[return_type], tokens[name], "".join(tokens[index + 1:arguments_end])
+
+    def is_body_end(self, index):
+        """
+        A method body can end only by a closing brace that is followed by a character other than ";"
+        :param index: index of a brace
+        :return: True if the body can end at the given index
+        """
+        return self.text[index] == "}" and index + 1 < len(self.text) and self.text[index + 1] != ";"
+
+    def get_body_end(self, body_start):
+        """
+        Find where the body which starts at the given index ends,
+        if its closing brace is followed by ";" (an anonymous class) the body continues,
+        skipping the inner blocks, until a closing brace that can end it
+        :param body_start: index of the opening brace of the body
+        :return: index of the closing brace of the body, or -1 if the body is not closed
+        """
+        if body_start not in self.closing_braces:
+            return -1
+        brace = self.braces_indexes[self.closing_braces[body_start]]
+        visited = list()
+        while not self.is_body_end(self.braces[brace]):
+            visited.append(brace)
+            brace = brace + 1
+            while brace < len(self.braces) and self.braces[brace] in self.closing_braces:
+                # skip the inner block
+                brace = self.braces_indexes[self.closing_braces[self.braces[brace]]] + 1
+            if brace >= len(self.braces) or brace in self.unclosed_braces:
+                # no need to walk again from any of the visited braces
+                self.unclosed_braces.update(visited)
+                return -1
+        return self.braces[brace]
+
+    def scan(self):
+        """
+        This method walks the braces and extracts all the methods, the methods inside a method body (of the
+        anonymous and inner classes) are skipped
+        :return: list of tuples [(access_modifier, return_type, name, arguments, (body_start, body_end)),...],
+        the body is text[body_start:body_end] (from its opening brace to its closing brace)
+        """
+        methods = list()
+        self.find_braces()
+        position = 0
+        for (brace, body_start) in enumerate(self.braces):
+            if self.text[body_start] != "{":
+                continue
+            signature = self.match_signature(self.braces_tokens[brace], position)
+            if signature is None:
+                continue
+            if self.parse_budget is not None:
+                self.parse_budget.check()
+            body_end = self.get_body_end(body_start)
+            if body_end == -1:
+                continue
+            methods.append(signature + ((body_start, body_end + 1),))
+            # the token after the body is part of the method match
+            position = self.braces_tokens[self.braces_indexes[body_end]] + 2
+        return methods
+
+    def scan_signatures(self):
+        """
+        This method is the cheap fallback of scan, it extracts only the methods signatures, the braces are not
+        walked so the bodies are not found (and the methods of inner classes are included)
+        :return: list of tuples [(access_modifier, return_type, name, arguments, None),...]
+        """
+        methods = list()
+        for body_token in self.tokens_scanner.find_tokens("{"):
+            signature = self.match_signature(body_token)
+            if signature is not None:
+                methods.append(signature + (None,))
+        return methods
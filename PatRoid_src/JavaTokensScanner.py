@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+from RegexRegistry import RegexRegistry
+
+#############
+# CONSTANTS #
+#############
+
+# the words, the spaces runs and every other character, each one is a token
+JAVA_TOKENS_REGEX = r"\w+|\s+|[^\w\s]"
+CLASS_KEYWORD = "class"
+EXTENDS_KEYWORD = "extends"
+# the most tokens a field declaration has before its name (modifier, spaces, type, "[", "]", spaces)
+DECLARATION_TOKENS = 6
+
+
+class JavaTokensScanner(object):
+    """
+    This class extracts the classes headers, the fields declarations and the static methods calls of a java source
+    (after the lexer stage, check JavaLexer) from a single tokens sweep, the same tokens are used to extract the
+    methods (check JavaMethodsScanner),
+    the text is split once into tokens, then each extractor jumps to the tokens it needs ("class" words, "=" and
+    "(" found by list lookups) and applies its own rule from there, so the extractors don't overlap each other,
+    and each extractor keeps the matches of the regex it replaces (the regex is given in its docstring)
+    """
+    tokens_pattern = RegexRegistry.register("JAVA_TOKENS_REGEX", JAVA_TOKENS_REGEX)
+
+    def __init__(self, text):
+        """
+        Constructor
+        :param text: The java source to scan
+        """
+        self.text = text
+        self.tokens = RegexRegistry.findall("JAVA_TOKENS_REGEX", text)
+
+    @staticmethod
+    def is_space(token):
+        """
+        :param token: token string
+        :return: True if the token is a spaces run
+        """
+        return token[:1].isspace()
+
+    @staticmethod
+    def is_word(token):
+        """
+        :param token: token string
+        :return: True if the token is a word (\\w+)
+        """
+        return len(token) > 1 and not token[0].isspace() or token.isalnum() or token == "_"
+
+    def get_token(self, index):
+        """
+        Get the token at the given index
+        :param index: token index
+        :return: token string, empty string out of the tokens
+        """
+        return self.tokens[index] if 0 <= index < len(self.tokens) else ""
+
+    def get_offsets(self, indexes):
+        """
+        Get the offsets in the text of the given tokens
+        :param indexes: tokens indexes, in the text order
+        :return: list of the offsets
+        """
+        tokens = self.tokens
+        offsets = list()
+        offset = 0
+        previous = 0
+        for index in indexes:
+            offset = offset + sum(map(len, tokens[previous:index]))
+            offsets.append(offset)
+            previous = index
+        return offsets
+
+    def find_tokens(self, token):
+        """
+        This method finds all the occurrences of the given token
+        :param token: token string
+        :return: generator of the tokens indexes, in the text order
+        """
+        tokens = self.tokens
+        index = -1
+        while True:
+            try:
+                index = tokens.index(token, index + 1)
+            except ValueError:
+                return
+            yield index
+
+    def find_last_pair(self, first_token, second_token=None):
+        """
+        Find the last occurrence of the given token, or of the given two adjacent tokens
+        :param first_token: token string
+        :param second_token: token string that follows the first token (None for a single token)
+        :return: index of the (first) token, -1 if not found
+        """
+        tokens = self.tokens
+        reversed_tokens = tokens[::-1]
+        searched_token = first_token if second_token is None else second_token
+        index = -1
+        while True:
+            try:
+                index = reversed_tokens.index(searched_token, index + 1)
+            except ValueError:
+                return -1
+            if second_token is None:
+                return len(tokens) - 1 - index
+            if index + 1 < len(tokens) and reversed_tokens[index + 1] == first_token:
+                return len(tokens) - 2 - index
+
+    def find_classes_headers(self):
+        """
+        This method finds the classes headers, the replaced regex is: class\\s+(\\w+)(?:\\s+extends\\s+(\\w+))*
+        a word that ends with "class" followed by the class name, and optionally by "extends" and the parent
+        (the last one if it is repeated)
+        :return: list of tuples [(class_name, parent or ""), ...]
+        """
+        tokens = self.tokens
+        class_words = [word for word in set(tokens) if word.endswith(CLASS_KEYWORD)]
+        indexes = sorted([index for word in class_words for index in self.find_tokens(word)])
+        headers = list()
+        position = 0
+        for index in indexes:
+            if index < position or not self.is_space(self.get_token(index + 1)) or \
+                    not self.is_word(self.get_token(index + 2)):
+                continue
+            class_name = tokens[index + 2]
+            parent = ""
+            position = index + 3
+            while self.is_space(self.get_token(position)) and self.get_token(position + 1) == EXTENDS_KEYWORD and \
+                    self.is_space(self.get_token(position + 2)) and self.is_word(self.get_token(position + 3)):
+                parent = tokens[position + 3]
+                position = position + 4
+            headers.append((class_name, parent))
+        return headers
+
+    def match_type_and_name(self, index, assignment):
+        """
+        This method matches a type and a name that end at the given "=", the replaced regex part is:
+        (\\w+)\\[{0,1}\\]{0,1}\\s+(\\w+)\\s*=
+        :param index: index of the type token
+        :param assignment: index of the "=" token
+        :return: tuple (data_type, name), None if they don't match
+        """
+        data_type = self.get_token(index)
+        if not self.is_word(data_type):
+            return None
+        index = index + 1
+        if self.get_token(index) == "[":
+            index = index + 1
+        if self.get_token(index) == "]":
+            index = index + 1
+        if not self.is_space(self.get_token(index)) or not self.is_word(self.get_token(index + 1)):
+            return None
+        name_end = index + 2
+        if self.is_space(self.get_token(name_end)):
+            name_end = name_end + 1
+        if name_end != assignment:
+            return None
+        return data_type, self.get_token(index + 1)
+
+    def match_declaration(self, start, assignment):
+        """
+        This method matches a field declaration from the given token to the given "=" as the regex
+        (\\w*)\\s*(\\w+)\\[{0,1}\\]{0,1}\\s+(\\w+)\\s*= matches from the token start, with its backtracking:
+        "final Foo foo =" is ("final", "Foo", "foo"), "Foo foo =" is ("Fo", "o", "foo") and " Foo foo =" (from the
+        spaces) is ("", "Foo", "foo")
+        :param start: index of the first token
+        :param assignment: index of the "=" token
+        :return: tuple (modifier, data_type, name), None if it doesn't match
+        """
+        token = self.get_token(start)
+        if self.is_space(token):
+            type_and_name = self.match_type_and_name(start + 1, assignment)
+            return ("",) + type_and_name if type_and_name is not None else None
+        if not self.is_word(token):
+            return None
+        if self.is_space(self.get_token(start + 1)):
+            type_and_name = self.match_type_and_name(start + 2, assignment)
+            if type_and_name is not None:
+                return (token,) + type_and_name
+        type_and_name = self.match_type_and_name(start, assignment)
+        if type_and_name is not None:
+            return token[:-1], token[-1], type_and_name[1]
+        return None
+
+    def find_fields_declarations(self):
+        """
+        This method finds the fields (and variables) declarations with a value, the replaced regex is:
+        (\\w*)\\s*(\\w+)\\[{0,1}\\]{0,1}\\s+(\\w+)\\s*=.*?; (not starting inside a word or a spaces run)
+        a declaration ends at an "=" and its match runs to the first ";" after it, for each "=" the few tokens
+        before it are tried in the text order, as the regex tries its start positions
+        :return: list of tuples [(modifier, data_type, name), ...]
+        """
+        tokens = self.tokens
+        last_semicolon = self.find_last_pair(";")
+        declarations = list()
+        position = 0
+        for assignment in self.find_tokens("="):
+            if assignment > last_semicolon:
+                break
+            if assignment < position:
+                continue
+            # the name before the "=" (and the spaces before the name) are common to all the start tokens
+            name = assignment - 2 if self.is_space(self.get_token(assignment - 1)) else assignment - 1
+            if not self.is_word(self.get_token(name)) or not self.is_space(self.get_token(name - 1)):
+                continue
+            for start in range(max(position, name - DECLARATION_TOKENS), name - 1):
+                declaration = self.match_declaration(start, assignment)
+                if declaration is not None:
+                    declarations.append(declaration)
+                    position = tokens.index(";", assignment) + 1
+                    break
+        return declarations
+
+    def find_static_calls(self):
+        """
+        This method finds the class (or object) of the static method call, the replaced regex is:
+        (\\w+)\\.\\w+\\(.*\\); its greedy match runs to the last ");" of the text, so only the first call before it
+        is found
+        :return: list with the first class or object name, empty if there is no call
+        """
+        tokens = self.tokens
+        last_call_end = self.find_last_pair(")", ";")
+        for index in self.find_tokens("("):
+            if index > last_call_end:
+                break
+            if index >= 3 and tokens[index - 2] == "." and self.is_word(tokens[index - 1]) and \
+                    self.is_word(tokens[index - 3]):
+                return [tokens[index - 3]]
+        return list()
+
+    def scan(self):
+        """
+        This method extracts the classes headers, the fields declarations and the static methods calls
+        :return: tuple of lists (classes_headers, fields_declarations, static_calls)
+        """
+        return self.find_classes_headers(), self.find_fields_declarations(), self.find_static_calls()
@@ -4,35 +4,129 @@
 # Python Imports #
 ##################
 
-import xml.etree.ElementTree as ET
+try:
+    import xml.etree.cElementTree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 #################
 # Local Imports #
 #################
 
-from JavaFilesInfo import JavaFilesInfo
 from Common import CommonMethods
+from JavaFilesInfo import JavaFilesInfo
+from ClassNamesScanner import ClassNamesScanner
+from ClassReferenceGraph import ClassReferenceGraph
+
+#############
+# CONSTANTS #
+#############
+
+APPLICATION_DEPTH = 1
+COMPONENT_DEPTH = 2
 
 
 class ManifestParser(object):
     """
-    This class aims to parse the AndroidManifest.xml file and initialize an activity dictionary
+    This class aims to parse the AndroidManifest.xml file and initialize an activity dictionary,
+    the manifest is streamed once and its activities are indexed by name (with the categories of their
+    intent-filters), so big merged manifests are neither parsed again nor kept in memory
     """
-    def __init__(self, manifest_file):
+    def __init__(self, manifest_file, module_name=None):
         """
         Constructor
-        :param manifest_file: The full path to the manifest file
+        :param manifest_file: The full path to the manifest file (it can be a member of a project archive)
+        :param module_name: Name of the project module the manifest belongs to, the activities are tagged with it
         """
         self.manifest_file = manifest_file
+        self.module_name = module_name
+        self.xml_root = None
+        self.activities = None
+        self.activities_by_name = None
 
     def get_xml_root(self):
         """
-        parse xml
+        parse xml, the file is parsed only once
         :return: return the root node
         """
-        tree = ET.parse(self.manifest_file)
-        root = tree.getroot()
-        return root
+        if self.xml_root is None:
+            manifest = CommonMethods.open_file(self.manifest_file)
+            try:
+                tree = ET.parse(manifest)
+            finally:
+                manifest.close()
+            self.xml_root = tree.getroot()
+        return self.xml_root
+
+    def index_manifest(self):
+        """
+        This method streams the manifest file (iterparse) and indexes the activities of its application node,
+        each activity is kept as {"name": name, "intent_filters": [[category_attributes, ...], ...]},
+        the nodes are cleared as soon as they are indexed
+        :return: nothing, it sets the activities and activities_by_name attributes
+        """
+        self.activities = list()
+        self.activities_by_name = dict()
+        depth = -1
+        in_application = False
+        application_found = False
+        manifest = CommonMethods.open_file(self.manifest_file)
+        try:
+            for (event, node) in ET.iterparse(manifest, events=("start", "end")):
+                if event == "start":
+                    depth = depth + 1
+                    if depth == APPLICATION_DEPTH and node.tag == "application" and not application_found:
+                        in_application = True
+                        application_found = True
+                    continue
+                if in_application and depth == COMPONENT_DEPTH:
+                    if node.tag == "activity":
+                        self.index_activity(node)
+                    node.clear()
+                elif depth == APPLICATION_DEPTH:
+                    in_application = False
+                    node.clear()
+                depth = depth - 1
+        finally:
+            manifest.close()
+
+    def index_activity(self, activity):
+        """
+        This method adds the given activity node to the activities index
+        :param activity: activity node
+        :return: nothing
+        """
+        activity_name = None
+        for key, val in activity.attrib.iteritems():
+            if "}name" in key:
+                activity_name = val.split(".")[-1]
+                break
+        if not activity_name:
+            return
+        intent_filters = [[dict(category.attrib) for category in intent_filter.findall('category')]
+                          for intent_filter in activity.findall('intent-filter')]
+        indexed_activity = {"name": activity_name, "intent_filters": intent_filters}
+        self.activities.append(indexed_activity)
+        self.activities_by_name.setdefault(activity_name, indexed_activity)
+
+    def get_activities(self):
+        """
+        Get the indexed activities of the manifest, the manifest is indexed on the first call
+        :return: list of activities [{"name": name, "intent_filters": [[category_attributes, ...], ...]}, ...]
+        """
+        if self.activities is None:
+            self.index_manifest()
+        return self.activities
+
+    def get_activity(self, activity_name):
+        """
+        Look up an activity in the index by its name
+        :param activity_name: activity name (without the package)
+        :return: the indexed activity, None if the manifest doesn't declare it
+        """
+        if self.activities_by_name is None:
+            self.index_manifest()
+        return self.activities_by_name.get(activity_name)
 
     def get_specific_node_list(self, node_name, root_node=None):
         """
@@ -48,15 +142,15 @@ class ManifestParser(object):
         nodes = root_node.findall(node_name)
         return nodes
 
-    def get_category_value(self, categories_nodes):
+    def get_category_value(self, categories_attributes):
         """
-        This method search for the category type in the given nodes
-        :param categories_nodes: categories to search in
+        This method search for the category type in the given categories
+        :param categories_attributes: attributes of the categories nodes to search in
         :return: "LAUNCHER" OR "DEFAULT" OR None
         """
         category = None
-        for cat in categories_nodes:
-            for category_value in cat.attrib.values():
+        for cat in categories_attributes:
+            for category_value in cat.values():
                 if "DEFAULT" in category_value:
                     category = "DEFAULT"
                     break
@@ -71,62 +165,51 @@ class ManifestParser(object):
         :return: dictionary of activities {activity-name: activity-category}
         """
         activities_dict_list = list()
-        activities = self.get_specific_node_list('activity')
-        for activity in activities:
-            activities_dict = dict()
-            activity_name = None
-            category = None
-            for key, val in activity.attrib.iteritems():
-                if "}name" in key:
-                    activity_name = val.split(".")[-1]
-                    break
-            if activity_name:
-                intent_filter_node = self.get_specific_node_list('intent-filter', root_node=activity)
-                if len(intent_filter_node) == 1:
-                    categories_nodes = self.get_specific_node_list('category', root_node=intent_filter_node[0])
-                    category = self.get_category_value(categories_nodes)
-                else:
-                    category = None
-                activities_dict["name"] = activity_name
-                activities_dict["category"] = category
-                activities_dict_list.append(activities_dict)
+        for activity in self.get_activities():
+            intent_filters = activity.get("intent_filters")
+            if len(intent_filters) == 1:
+                category = self.get_category_value(intent_filters[0])
+            else:
+                category = None
+            activities_dict = {"name": activity.get("name"), "category": category}
+            if self.module_name is not None:
+                activities_dict["module"] = self.module_name
+            activities_dict_list.append(activities_dict)
         return activities_dict_list
 
-    def get_classes_related_to_activity(self, activity_name, java_files, classes, related_classes=list()):
+    def get_classes_related_to_activity(self, activity_name, java_files, classes, class_reference_graph=None):
         """
-        Generated a list of all the classes that mentioned in the give activity name recursively
+        Generated a list of all the classes that mentioned (as whole identifiers) in the give activity name recursively
         :param activity_name: Search for
         :param java_files:Search in
         :param classes: Name of classes
-        :param related_classes: list of already known relations
+        :param class_reference_graph: ClassReferenceGraph of the java_files (built if not given)
         :return: Final list
         """
-        activity_file = None
-        for file in java_files:
-            if file.endswith("%s.java" % activity_name):
-                activity_file = file
-                break
-        class_content = CommonMethods.read_file(activity_file)
-        classes_in_activity = [class_name for class_name in classes if class_name in class_content]
-        for class_name in classes_in_activity:
-            if class_name not in related_classes:
-                related_classes.extend(self.get_classes_related_to_activity(activity_name=class_name,
-                                                                            java_files=java_files, classes=classes,
-                                                                            related_classes=classes_in_activity))
-        related_classes.extend(classes_in_activity)
-        related_classes = list(dict.fromkeys(related_classes))
-        return related_classes
-
-    def get_activities_classes_dict(self, java_files):
+        if class_reference_graph is None:
+            class_reference_graph = ClassReferenceGraph(java_files, classes)
+        return class_reference_graph.get_related_classes(activity_name)
+
+    def get_activities_classes_dict(self, java_files, classes=None, classes_scanner=None, class_reference_graph=None):
         """
         This method prepare a dictionary of the activities and all the related classes to it.
         :param java_files: List of all java files in the project
+        :param classes: List of the java files classes names (check JavaFilesInfo.get_list_of_classes_names)
+        :param classes_scanner: ClassNamesScanner of the classes, to share the scanned files (built if not given)
+        :param class_reference_graph: ClassReferenceGraph of the java_files, to share it between the manifests of
+        the project modules (built if not given)
         :return: Dict{"activity_name": ["class1", "class2",...], ...}
         """
         activities_dict = self.get_activities_dictionary()
-        all_classes = JavaFilesInfo.get_list_of_classes_names(java_files)
+        all_classes = classes
+        if all_classes is None:
+            all_classes = JavaFilesInfo.get_list_of_classes_names(java_files)
+        if class_reference_graph is None:
+            if classes_scanner is None:
+                classes_scanner = ClassNamesScanner(all_classes)
+            class_reference_graph = ClassReferenceGraph(java_files, all_classes, classes_scanner=classes_scanner)
         for activity in activities_dict:
             activity_name = activity.get("name")
-            activity["classes"] = self.get_classes_related_to_activity(activity_name, java_files, all_classes)
+            activity["classes"] = self.get_classes_related_to_activity(activity_name, java_files, all_classes,
+                                                                       class_reference_graph=class_reference_graph)
         return activities_dict
-
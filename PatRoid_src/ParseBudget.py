@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import time
+
+#################
+# Local Imports #
+#################
+
+from ADPDException import ADPDException
+
+#############
+# CONSTANTS #
+#############
+
+DEFAULT_MAX_FILE_SIZE_KB = 1024
+DEFAULT_MAX_FILE_SECONDS = 10
+
+
+class ParseBudgetExceeded(ADPDException):
+    """
+    This exception is raised when a java file exceeds its parse budget,
+    the file is then handled by the fallback extractor (check JavaFilesInfo.get_fallback_file_facts)
+    """
+    pass
+
+
+class ParseBudget(object):
+    """
+    This class is the size and time budget of parsing a single java file, so one huge or badly formed file
+    (minified or generated java) doesn't stall the whole run,
+    a file bigger than the size budget is not parsed fully, and the time budget is checked between the extraction
+    steps and while scanning the methods, a single regex search can't be interrupted so its cost is bounded by the
+    size budget
+    """
+    def __init__(self, max_file_size_kb=DEFAULT_MAX_FILE_SIZE_KB, max_file_seconds=DEFAULT_MAX_FILE_SECONDS):
+        """
+        Constructor
+        :param max_file_size_kb: Size in KB of the biggest file to parse fully, zero means no limit
+        :param max_file_seconds: Seconds to parse a single file in, zero means no limit
+        """
+        self.max_file_size_kb = max_file_size_kb
+        self.max_file_seconds = max_file_seconds
+        self.start_time = time.time()
+
+    def start(self, content):
+        """
+        This method starts the budget of a file
+        :param content: The file content
+        :return: nothing, raise ParseBudgetExceeded if the file is bigger than the size budget
+        """
+        self.start_time = time.time()
+        size_kb = len(content) / 1024.0
+        if self.max_file_size_kb and size_kb > self.max_file_size_kb:
+            raise ParseBudgetExceeded("its size %.1f KB is over the %s KB budget" % (size_kb, self.max_file_size_kb))
+
+    def get_elapsed_seconds(self):
+        """
+        Get the time spent on the current file
+        :return: seconds since the budget started
+        """
+        return time.time() - self.start_time
+
+    def check(self):
+        """
+        This method checks the time budget of the current file
+        :return: nothing, raise ParseBudgetExceeded if the time budget is over
+        """
+        if self.max_file_seconds and self.get_elapsed_seconds() > self.max_file_seconds:
+            raise ParseBudgetExceeded("its parsing took over the %s seconds budget" % self.max_file_seconds)
@@ -14,6 +14,7 @@
 
 import sys
 import argparse
+import threading
 import traceback
 
 #################
@@ -21,12 +22,19 @@ import traceback
 #################
 
 from ADPDException import ADPDException
-from GetManiAndJava import GetManiAndJava
+from GetManiAndJava import GetManiAndJava, EXCLUDED_DIRECTORIES
 from ManifestParser import ManifestParser
+from ClassNamesScanner import ClassNamesScanner
+from ClassReferenceGraph import ClassReferenceGraph
 from JavaFilesInfo import JavaFilesInfo
+from FactsCache import FactsCache, CACHE_DIR_NAME, DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE_MB
+from ParseBudget import ParseBudget, DEFAULT_MAX_FILE_SIZE_KB, DEFAULT_MAX_FILE_SECONDS
 from CreateRelationsModule import CreateRelationsModule
-from SubPatterns import SubPatterns
-from DetectDP import DetectDP
+from RelationsGraph import RelationsGraph
+from SubPatterns import SubPatterns, SUB_PATTERNS
+from SymbolTable import SymbolTable
+from DetectDP import DetectDP, DESIGN_PATTERNS
+from RegexRegistry import RegexRegistry
 from Logger import Logger
 logger = Logger()
 
@@ -59,11 +67,52 @@ def add_args():
     debug = parser.add_argument_group("Running Mode")
     project_location = parser.add_argument_group("Android project source code")
     module_name = parser.add_argument_group("Name and location of the relationships module")
-    project_location.add_argument("-p", "--path", dest="project_path", help="A path to the input project to extract "
-                                                                            "design patterns from", default=None)
+    patterns = parser.add_argument_group("Design patterns")
+    performance = parser.add_argument_group("Performance")
+    project_location.add_argument("-p", "--path", dest="project_path", help="A path to the input project (a directory, "
+                                                                            "or a .zip or .tar.gz archive of it) to "
+                                                                            "extract design patterns from", default=None)
+    project_location.add_argument("--exclude", dest="exclude", help="Glob of the files or directories to skip in "
+                                                                     "the project path (can be repeated), the %s "
+                                                                     "directories are always skipped"
+                                                                     % ", ".join(EXCLUDED_DIRECTORIES),
+                                  default=None, action='append', metavar="GLOB")
     module_name.add_argument("-m", "--module-file-name", dest="module_file_name", help="XML file to save the "
                                                                                        "relationships in and/or read "
                                                                                        "them from", default=None)
+    module_name.add_argument("--no-module-file", dest="write_module_file", help="Don't write the relationships "
+                                                                               "module when building it from a "
+                                                                               "project path", default=True,
+                             action='store_false')
+    performance.add_argument("-j", "--jobs", dest="jobs", help="Number of processes to parse the java files in, "
+                                                               "0 means all the cpu cores (default: 1)", default=1,
+                             type=int)
+    performance.add_argument("--no-cache", dest="use_cache", help="Don't use the parsed java files cache",
+                             default=True, action='store_false')
+    performance.add_argument("--cache-dir", dest="cache_dir", help="Directory to keep the parsed java files cache in "
+                                                                   "(default: ~/%s)" % CACHE_DIR_NAME,
+                             default=DEFAULT_CACHE_DIR)
+    performance.add_argument("--cache-size", dest="cache_size", help="Maximum size of the parsed java files cache "
+                                                                     "in MB, the least recently used files are "
+                                                                     "evicted (default: %s)" % DEFAULT_CACHE_SIZE_MB,
+                             default=DEFAULT_CACHE_SIZE_MB, type=int)
+    performance.add_argument("--max-file-size", dest="max_file_size", help="Size in KB of the biggest java file to "
+                                                                           "parse fully, only the classes and the "
+                                                                           "methods signatures of a bigger file are "
+                                                                           "extracted, 0 means no limit (default: %s)"
+                                                                           % DEFAULT_MAX_FILE_SIZE_KB,
+                             default=DEFAULT_MAX_FILE_SIZE_KB, type=int, metavar="KB")
+    performance.add_argument("--max-file-seconds", dest="max_file_seconds", help="Seconds to parse a single java "
+                                                                                 "file in, only the classes and the "
+                                                                                 "methods signatures of a slower "
+                                                                                 "file are extracted, 0 means no "
+                                                                                 "limit (default: %s)"
+                                                                                 % DEFAULT_MAX_FILE_SECONDS,
+                             default=DEFAULT_MAX_FILE_SECONDS, type=float, metavar="SECONDS")
+    patterns.add_argument("--patterns", dest="patterns", help="Comma separated design patterns to detect, only the "
+                                                              "sub-patterns they need are found (default: all), "
+                                                              "choose from: %s" % ", ".join(DESIGN_PATTERNS),
+                          default=None)
     debug.add_argument("-d", "--debug-mode", dest="debug_mode", help="Print traceback", default=False,
                        action='store_true')
     return parser
@@ -80,6 +129,16 @@ def parse_ags():
     elif args.module_file_name is None:
         logger.warning("Module file name is missing, will use default name instead: %s"% DEFAULT_MODULE_NAME)
         args.module_file_name = DEFAULT_MODULE_NAME
+    if args.jobs < 0:
+        raise ADPDException("Number of jobs can't be negative: %s" % args.jobs)
+    if args.cache_size <= 0:
+        raise ADPDException("Cache size should be a positive number of MB: %s" % args.cache_size)
+    if args.max_file_size < 0 or args.max_file_seconds < 0:
+        raise ADPDException("Java file parse budget can't be negative: %s KB, %s seconds" % (args.max_file_size,
+                                                                                            args.max_file_seconds))
+    if args.patterns is not None:
+        args.patterns = DetectDP.get_design_patterns([pattern.strip() for pattern in args.patterns.split(",")
+                                                      if pattern.strip()])
     return args
 
 ################
@@ -110,116 +169,150 @@ class Driver(object):
         self.ipd_relations = None
         self.mli_relations = None
         self.sass_relations = None
+        self.relations_graph = None
+        self.symbol_table = None
+        self.module_file_writer = None
+        self.module_file_error = None
 
-
-    @staticmethod
-    def build_module_file_flow(args):
+    def build_module_file_flow(self, args):
+        """
+        This method extracts the relations from the project source code and keeps them in memory as a graph,
+        the relations module file is written in the background
+        :param args: Project cmd line args
+        :return: rc
+        """
         rc = 0
-        get_mani_and_java = GetManiAndJava(args.project_path)
+        get_mani_and_java = GetManiAndJava(args.project_path, exclude=args.exclude)
         java_files = get_mani_and_java.get_all_java_files()
+        if get_mani_and_java.skipped_paths:
+            logger.info("Skipped paths (#%s): \n%s" % (len(get_mani_and_java.skipped_paths),
+                                                       "\n".join(get_mani_and_java.skipped_paths)))
         if len(java_files) == 0:
             raise ADPDException("Project doesn't contain any java files")
-        manifest_file = get_mani_and_java.get_project_manifest()
-        if manifest_file is None:
+        modules = get_mani_and_java.get_project_modules()
+        if len(modules) == 0:
             raise ADPDException("Project doesn't contain a Manifest file")
-        logger.info("Manifest file is: \n%s" % manifest_file)
-        parse_manifest = ManifestParser(manifest_file)
-        manifest_info = parse_manifest.get_activities_classes_dict(java_files)
+        for module in modules:
+            logger.info("Module [%s] manifest file is (#%s java files): \n%s" % (module.get("name"),
+                                                                                 len(module.get("java_files")),
+                                                                                 module.get("manifest")))
+        files_headers = get_mani_and_java.get_files_headers()
+        java_classes = JavaFilesInfo.get_list_of_classes_names(java_files)
+        symbol_table = SymbolTable(java_classes)
+        classes_scanner = ClassNamesScanner(java_classes, files_headers=files_headers)
+        class_reference_graph = ClassReferenceGraph(java_files, java_classes, classes_scanner=classes_scanner)
+        manifest_info = list()
+        for module in modules:
+            parse_manifest = ManifestParser(module.get("manifest"), module_name=module.get("name"))
+            activities = parse_manifest.get_activities_classes_dict(java_files, classes=java_classes,
+                                                                    class_reference_graph=class_reference_graph)
+            manifest_info.extend(activities)
         logger.info("Activities are: %s" % manifest_info)
         logger.info("Java files are (#%s): \n%s" % (len(java_files), "\n".join(java_files)))
-        java_classes = JavaFilesInfo.get_list_of_classes_names(java_files)
         logger.info("Java classes are: %s" % java_classes)
-        inheritance_relation = JavaFilesInfo.get_inherentance_relations(java_files)
-        logger.info("Inheritance: %s" % inheritance_relation)
-        association_relation = JavaFilesInfo.get_association_relations(java_files)
-        logger.info("Association relationships are between: %s" % association_relation)
-        aggregation_relation = JavaFilesInfo.get_aggregation_relations(java_files)
-        logger.info("Aggregation relationships are between: %s" % aggregation_relation)
-        depends_relation = JavaFilesInfo.get_depends_relations(java_files)
-        logger.info("Depends relationships are between: %s" % depends_relation)
-        build_module_file = CreateRelationsModule(args.module_file_name)
-        logger.info("Writing relations to the module file...")
-        build_module_file.build_relations_module(depends_relation, association_relation, inheritance_relation,
-                                                 aggregation_relation, manifest_info)
-        logger.info("Done")
+        logger.info("Extracting java files facts...")
+        cache = None
+        if args.use_cache:
+            try:
+                cache = FactsCache(args.cache_dir, max_size_mb=args.cache_size)
+            except ADPDException as exp:
+                logger.warning("%s, continue without cache" % exp)
+        parse_budget = ParseBudget(max_file_size_kb=args.max_file_size, max_file_seconds=args.max_file_seconds)
+        files_facts = JavaFilesInfo.get_files_facts(java_files, jobs=args.jobs, cache=cache,
+                                                    files_headers=files_headers, parse_budget=parse_budget)
+        if cache is not None:
+            logger.info("Cached java files: %s, parsed java files: %s" % (cache.hits, cache.misses))
+            cache.close()
+        slow_files = ["%s: %s" % (file_facts.file_path, file_facts.fallback_reason) for file_facts in files_facts
+                      if file_facts.fallback_reason is not None]
+        if slow_files:
+            logger.warning("Java files over the parse budget, only their classes and methods signatures are "
+                           "extracted (#%s): \n%s" % (len(slow_files), "\n".join(slow_files)))
+        inheritance_relation = JavaFilesInfo.get_inherentance_relations(java_files, files_facts=files_facts,
+                                                                        symbol_table=symbol_table)
+        logger.info("Inheritance: %s" % inheritance_relation.get_relations())
+        association_relation = JavaFilesInfo.get_association_relations(java_files, files_facts=files_facts,
+                                                                       symbol_table=symbol_table,
+                                                                       classes_scanner=classes_scanner)
+        logger.info("Association relationships are between: %s" % association_relation.get_relations())
+        aggregation_relation = JavaFilesInfo.get_aggregation_relations(java_files, files_facts=files_facts,
+                                                                       symbol_table=symbol_table,
+                                                                       classes_scanner=classes_scanner)
+        logger.info("Aggregation relationships are between: %s" % aggregation_relation.get_relations())
+        depends_relation = JavaFilesInfo.get_depends_relations(java_files, files_facts=files_facts,
+                                                               symbol_table=symbol_table,
+                                                               classes_scanner=classes_scanner)
+        logger.info("Depends relationships are between: %s" % depends_relation.get_relations())
+        self.relations_graph = RelationsGraph.from_relations({"depends": depends_relation,
+                                                              "association": association_relation,
+                                                              "inheritance": inheritance_relation,
+                                                              "aggregation": aggregation_relation},
+                                                             symbol_table=symbol_table)
+        if args.write_module_file:
+            build_module_file = CreateRelationsModule(args.module_file_name)
+            logger.info("Writing relations to the module file in the background...")
+            self.module_file_writer = threading.Thread(target=self.write_module_file,
+                                                       args=(build_module_file, depends_relation,
+                                                             association_relation, inheritance_relation,
+                                                             aggregation_relation, manifest_info))
+            self.module_file_writer.start()
         return rc
 
-    def set_definitions(self):
+    def write_module_file(self, build_module_file, depends_relation, association_relation, inheritance_relation,
+                          aggregation_relation, manifest_info):
+        """
+        This method writes the relations module file, it runs in the module file writer thread
+        :return: nothing, the error (if any) is kept to be raised by wait_for_module_file
         """
-        This method set all 15 definitions
+        try:
+            build_module_file.build_relations_module(depends_relation, association_relation, inheritance_relation,
+                                                     aggregation_relation, manifest_info)
+        except Exception as exp:
+            self.module_file_error = exp
+
+    def wait_for_module_file(self):
+        """
+        This method waits for the module file writer thread (if it was started) to finish
+        :return: raise an exception if the module file couldn't be written
+        """
+        if self.module_file_writer is None:
+            return
+        self.module_file_writer.join()
+        self.module_file_writer = None
+        if self.module_file_error is not None:
+            raise ADPDException("Couldn't write the relations module file: %s" % self.module_file_error)
+        logger.info("Done writing relations to the module file")
+
+    def set_definitions(self, args, patterns=None):
+        """
+        This method set the definitions needed to detect the given design patterns (all 15 by default)
+        :param: args: Project cmd line args
+        :param patterns: list of design patterns names, None means all the design patterns
         :return: it sets values as class parameters
         """
-        sub_patterns = SubPatterns(args.module_file_name)
-        self.ica_relations = sub_patterns.ICA()
-        logger.info("1. ICA relations: %s" % self.ica_relations)
-        self.ci_relations = sub_patterns.CI()
-        logger.info("2. CI relations: %s" % self.ci_relations)
-        self.iagg_relations = sub_patterns.IAGG()
-        logger.info("3. IAGG relations: %s" % self.iagg_relations)
-        self.ipag_relations = sub_patterns.IPAG()
-        logger.info("4. IPAG relations: %s" % self.ipag_relations)
-        self.mli_relations = sub_patterns.MLI()
-        logger.info("5. MLI relations: %s" % self.mli_relations)
-        self.iass_relations = sub_patterns.IASS()
-        logger.info("6. IASS relations: %s" % self.iass_relations)
-        self.sagg_relations = sub_patterns.SAGG()
-        logger.info("7. SAGG relations: %s" % self.sagg_relations)
-        self.iiagg_relations = sub_patterns.IIAGG()
-        logger.info("8. IIAGG relations: %s" % self.iiagg_relations)
-        self.sass_relations = sub_patterns.SASS()
-        logger.info("9. SASS relations: %s" % self.sass_relations)
-        self.icd_relations = sub_patterns.ICD()
-        logger.info("10. ICD relations: %s" % self.icd_relations)
-        self.dci_relations = sub_patterns.DCI()
-        logger.info("11. DCI relations: %s" % self.dci_relations)
-        self.ipas_relations = sub_patterns.IPAS()
-        logger.info("12. IPAS relations: %s" % self.ipas_relations)
-        self.agpi_relations = sub_patterns.AGPI()
-        logger.info("13. AGPI relations: %s" % self.agpi_relations)
-        self.ipd_relations = sub_patterns.IPD()
-        logger.info("14. IPD relations: %s" % self.ipd_relations)
-        self.dpi_relations = sub_patterns.DPI()
-        logger.info("15. DPI relations: %s" % self.dpi_relations)
+        sub_patterns = SubPatterns(args.module_file_name, relations_graph=self.relations_graph)
+        self.symbol_table = sub_patterns.get_relations_graph().symbol_table
+        needed_sub_patterns = DetectDP.get_needed_sub_patterns(patterns)
+        for (index, name) in enumerate(SUB_PATTERNS, 1):
+            if name not in needed_sub_patterns:
+                continue
+            relations = sub_patterns.get_sub_pattern(name)
+            setattr(self, "%s_relations" % name.lower(), relations)
+            logger.info("%s. %s relations: %s" % (index, name, self.symbol_table.get_names(relations)))
 
-    def detect_design_patterns(self):
+    def detect_design_patterns(self, patterns=None):
         """
         This method calls the design patterns detection class methods, to filter and print detected design patterns
-        :return: dict of design patterns and where they found
+        :param patterns: list of design patterns names, None means all the design patterns
+        :return: dict of design patterns and where they found (by the classes names)
         """
         detected_design_patterns = dict()
-        detect_dp = DetectDP()
-        detected_design_patterns["singleton"] = detect_dp.detect_singleton(self.sass_relations)
-        detected_design_patterns["composite"] = detect_dp.detect_composite(self.sagg_relations, self.ci_relations,
-                                                                  self.iiagg_relations, self.iagg_relations)
-        detected_design_patterns["template"] = detect_dp.detect_template(self.ci_relations)
-        detected_design_patterns["abstract_factory"] = detect_dp.detect_abstract_factory(self.dci_relations, self.icd_relations,
-                                                                         self.ci_relations)
-        detected_design_patterns["adapter"] = detect_dp.detect_adapter(self.ci_relations, self.ica_relations)
-        detected_design_patterns["bridge"] = detect_dp.detect_bridge(self.ipag_relations, self.ci_relations)
-        detected_design_patterns["builder"] = detect_dp.detect_builder(self.ica_relations, self.agpi_relations)
-        detected_design_patterns["chain_of_responsibility"] = detect_dp.detect_chain_of_responsibility(self.sass_relations, self.ci_relations)
-        detected_design_patterns["command"] = detect_dp.detect_command(self.agpi_relations, self.ica_relations)
-        detected_design_patterns["decorator"] = detect_dp.detect_decorator(self.ci_relations, self.iagg_relations,
-                                                                  self.mli_relations)
-        detected_design_patterns["facad"] = detect_dp.detect_facad(self.icd_relations)
-        detected_design_patterns["factory"] = detect_dp.detect_factory(self.icd_relations, self.dci_relations)
-        detected_design_patterns["flyweight"] = detect_dp.detect_flyweight(self.ci_relations, self.agpi_relations)
-        detected_design_patterns["interpreter"] = detect_dp.detect_interpreter(self.iagg_relations, self.ipd_relations,
-                                                                    self.ci_relations)
-        detected_design_patterns["iterator"] = detect_dp.detect_iterator(self.dci_relations, self.ica_relations,
-                                                                 self.icd_relations)
-        detected_design_patterns["mediator"] = detect_dp.detect_mediator(self.ica_relations, self.ci_relations,
-                                                                 self.ipas_relations)
-        detected_design_patterns["memento"] = detect_dp.detect_memento(self.agpi_relations, self.dpi_relations)
-        detected_design_patterns["observer"] = detect_dp.detect_observer(self.agpi_relations, self.icd_relations)
-        detected_design_patterns["prototype"] = detect_dp.detect_prototype(self.ci_relations, self.agpi_relations)
-        detected_design_patterns["proxy"] = detect_dp.detect_proxy(self.ci_relations, self.ica_relations,
-                                                              self.iass_relations)
-        detected_design_patterns["state"] = detect_dp.detect_state(self.agpi_relations, self.ci_relations)
-        detected_design_patterns["strategy"] = detect_dp.detect_strategy(self.agpi_relations, self.ci_relations)
-        detected_design_patterns["visitor"] = detect_dp.detect_visitor(self.agpi_relations, self.icd_relations,
-                                                                self.dpi_relations)
-        return detected_design_patterns
+        detect_dp = DetectDP(self.symbol_table)
+        sub_patterns_relations = dict((name, getattr(self, "%s_relations" % name.lower()))
+                                      for name in DetectDP.get_needed_sub_patterns(patterns))
+        for pattern in DetectDP.get_design_patterns(patterns):
+            detected_design_patterns[pattern] = detect_dp.detect(pattern, sub_patterns_relations)
+        return detect_dp.get_names(detected_design_patterns)
 
     def print_dp_final_dict(self, detected_design_patterns):
         """
@@ -239,14 +332,17 @@ class Driver(object):
         """
         rc = 0
         if args.project_path:
-            rc = Driver.build_module_file_flow(args) or rc
-        self.set_definitions()
-        detected_design_patterns = self.detect_design_patterns()
+            rc = self.build_module_file_flow(args) or rc
+        self.set_definitions(args, args.patterns)
+        detected_design_patterns = self.detect_design_patterns(args.patterns)
         self.print_dp_final_dict(detected_design_patterns)
+        self.wait_for_module_file()
+        RegexRegistry.dump_counters()
         return rc
 
 
 if __name__ == "__main__":
+    args = None
     try:
         args = parse_ags()
         driver = Driver()
@@ -254,6 +350,6 @@ if __name__ == "__main__":
         sys.exit(rc)
     except Exception as exp:
         logger.error("%s" % exp)
-        if args.debug_mode:
+        if args is not None and args.debug_mode:
             traceback.print_exc()
         sys.exit(1)
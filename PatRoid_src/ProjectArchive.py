@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import io
+import os
+import tarfile
+import zipfile
+
+#################
+# Local Imports #
+#################
+
+from ADPDException import ADPDException
+
+#############
+# CONSTANTS #
+#############
+
+ZIP_EXTENSIONS = [".zip"]
+TAR_EXTENSIONS = [".tar.gz", ".tgz"]
+ARCHIVE_READ_FILES_EXTENSIONS = [".java", ".xml"]
+
+
+class ProjectArchive(object):
+    """
+    This class gives access to a project source code kept in a zip (or tar.gz) archive without extracting it,
+    the archive members are given paths under the archive path (archive.zip/dir/File.java),
+    so they are walked and read the same way as the files on disk (check GetManiAndJava and CommonMethods),
+    the members of a zip archive are read when needed, a tar.gz archive is streamed once and the content of its
+    java and xml members is kept in memory
+    """
+    opened_archives = dict()
+
+    def __init__(self, archive_path):
+        """
+        Constructor
+        :param archive_path: The full path to the archive file
+        """
+        self.archive_path = archive_path
+        self.members = dict()
+        self.children = {archive_path: list()}
+        self.contents = None
+        self.zip_file = None
+        self.zip_file_pid = None
+        try:
+            if ProjectArchive.is_zip(archive_path):
+                for member in self.get_zip_file().infolist():
+                    self.add_member(member.filename, member.filename.endswith("/"))
+            else:
+                self.contents = dict()
+                tar_file = tarfile.open(archive_path, "r|*")
+                try:
+                    for member in tar_file:
+                        file_path = self.add_member(member.name, member.isdir())
+                        if file_path is not None and member.isfile() and \
+                                os.path.splitext(member.name)[1] in ARCHIVE_READ_FILES_EXTENSIONS:
+                            self.contents[file_path] = tar_file.extractfile(member).read()
+                finally:
+                    tar_file.close()
+        except (zipfile.BadZipfile, tarfile.TarError, IOError, OSError) as exp:
+            raise ADPDException("Couldn't read the archive %s: %s" % (archive_path, exp))
+
+    @staticmethod
+    def is_zip(file_path):
+        """
+        Check if the given path is a zip archive name
+        :param file_path: file path
+        :return: True if it ends with a zip extension
+        """
+        return any(file_path.lower().endswith(extension) for extension in ZIP_EXTENSIONS)
+
+    @staticmethod
+    def is_archive(file_path):
+        """
+        Check if the given path is an archive file this class can read
+        :param file_path: file path
+        :return: True if it is a zip or a tar.gz file
+        """
+        return os.path.isfile(file_path) and \
+            any(file_path.lower().endswith(extension) for extension in ZIP_EXTENSIONS + TAR_EXTENSIONS)
+
+    @staticmethod
+    def open_archive(archive_path):
+        """
+        Get the ProjectArchive of the given archive, each archive is opened only once
+        :param archive_path: The full path to the archive file
+        :return: ProjectArchive object
+        """
+        if archive_path not in ProjectArchive.opened_archives:
+            ProjectArchive.opened_archives[archive_path] = ProjectArchive(archive_path)
+        return ProjectArchive.opened_archives[archive_path]
+
+    @staticmethod
+    def get_archive_of(file_path):
+        """
+        Find the archive the given path is a member of, the archive is opened if needed
+        (e.g. in the parsing worker processes)
+        :param file_path: file path
+        :return: ProjectArchive object, None if the path is not in an archive
+        """
+        for (archive_path, archive) in ProjectArchive.opened_archives.items():
+            if file_path.startswith(archive_path + os.sep):
+                return archive
+        lower_file_path = file_path.lower()
+        if not any(extension + os.sep in lower_file_path for extension in ZIP_EXTENSIONS + TAR_EXTENSIONS):
+            return None
+        directory = os.path.dirname(file_path)
+        while directory and directory != os.path.dirname(directory):
+            if ProjectArchive.is_archive(directory):
+                return ProjectArchive.open_archive(directory)
+            directory = os.path.dirname(directory)
+        return None
+
+    def add_member(self, member_name, is_directory):
+        """
+        This method adds the given member and its parent directories to the archive tree
+        :param member_name: member name in the archive
+        :param is_directory: True for directories
+        :return: the member path under the archive path, None if the member name is empty
+        """
+        parts = [part for part in member_name.split("/") if part and part != "." and part != ".."]
+        if not parts:
+            return None
+        directory = self.archive_path
+        for (index, part) in enumerate(parts):
+            file_path = os.path.join(directory, part)
+            part_is_directory = is_directory or index < len(parts) - 1
+            if file_path not in self.members:
+                self.members[file_path] = (member_name, part_is_directory)
+                self.children[directory].append((part, file_path, part_is_directory))
+                if part_is_directory:
+                    self.children[file_path] = list()
+            directory = file_path
+        return directory
+
+    def get_zip_file(self):
+        """
+        Get the opened zip file, it is opened again in a new process, so the processes don't share its offset
+        :return: zipfile.ZipFile object
+        """
+        if self.zip_file is None or self.zip_file_pid != os.getpid():
+            self.zip_file = zipfile.ZipFile(self.archive_path)
+            self.zip_file_pid = os.getpid()
+        return self.zip_file
+
+    def list_directory(self, directory):
+        """
+        This method lists the given directory of the archive
+        :param directory: directory path (the archive path for the archive root)
+        :return: list of tuples [(name, full_path, is_directory), ...] in the archive order
+        """
+        if directory not in self.children:
+            raise ADPDException("%s is not a directory in the archive %s" % (directory, self.archive_path))
+        return list(self.children[directory])
+
+    def read_member(self, file_path):
+        """
+        This method reads the given archive member
+        :param file_path: member path under the archive path
+        :return: content
+        """
+        if file_path not in self.members or self.members[file_path][1]:
+            raise ADPDException("%s is not a file in the archive %s" % (file_path, self.archive_path))
+        if self.contents is not None:
+            if file_path not in self.contents:
+                raise ADPDException("%s content is not kept from the archive %s" % (file_path, self.archive_path))
+            return self.contents[file_path]
+        try:
+            return self.get_zip_file().read(self.members[file_path][0])
+        except (zipfile.BadZipfile, KeyError, IOError) as exp:
+            raise ADPDException("Couldn't read %s from the archive %s: %s" % (file_path, self.archive_path, exp))
+
+    def open_member(self, file_path):
+        """
+        This method opens the given archive member as a file object
+        :param file_path: member path under the archive path
+        :return: file like object
+        """
+        if self.contents is not None:
+            return io.BytesIO(self.read_member(file_path))
+        if file_path not in self.members or self.members[file_path][1]:
+            raise ADPDException("%s is not a file in the archive %s" % (file_path, self.archive_path))
+        try:
+            return self.get_zip_file().open(self.members[file_path][0])
+        except (zipfile.BadZipfile, KeyError, IOError) as exp:
+            raise ADPDException("Couldn't read %s from the archive %s: %s" % (file_path, self.archive_path, exp))
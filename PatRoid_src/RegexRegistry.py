@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import re
+import time
+
+#################
+# Local Imports #
+#################
+
+from ADPDException import ADPDException
+from Logger import Logger
+logger = Logger()
+
+#############
+# CONSTANTS #
+#############
+
+# counters indexes
+INVOCATIONS = 0
+SCANNED_BYTES = 1
+MATCHES = 2
+SECONDS = 3
+
+
+class RegexRegistry(object):
+    """
+    This class is the registry of all the regex used in this project, each regex is compiled once
+    and registered by name, and for each regex it counts the invocations, the scanned bytes, the matches and the
+    time spent, so the counters show which regex takes the time (check dump_counters)
+    """
+    patterns = dict()
+    names = dict()
+    counters = dict()
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        pass
+
+    @staticmethod
+    def register(name, regex, flags=0):
+        """
+        This method compiles the given regex and registers it by the given name
+        :param name: name of the regex (e.g. its constant name)
+        :param regex: regex pattern string
+        :param flags: re flags
+        :return: compiled pattern object
+        """
+        if name not in RegexRegistry.patterns:
+            try:
+                RegexRegistry.patterns[name] = re.compile(regex, flags)
+            except Exception as exp:
+                raise ADPDException(exp)
+            RegexRegistry.names[(regex, flags)] = name
+        return RegexRegistry.patterns[name]
+
+    @staticmethod
+    def get_name(regex, flags=0):
+        """
+        Get the name of the given regex, a regex which was not registered is registered by its pattern string
+        :param regex: regex pattern string
+        :param flags: re flags
+        :return: name of the regex
+        """
+        if (regex, flags) not in RegexRegistry.names:
+            RegexRegistry.register(regex, regex, flags)
+        return RegexRegistry.names[(regex, flags)]
+
+    @staticmethod
+    def get_pattern(name):
+        """
+        Get the compiled pattern of the given regex name
+        :param name: name of a registered regex
+        :return: compiled pattern object
+        """
+        return RegexRegistry.patterns[name]
+
+    @staticmethod
+    def add_counters(name, scanned_bytes, matches, seconds, invocations=1):
+        """
+        This method adds to the counters of the given regex
+        :param name: name of the regex
+        :param scanned_bytes: length of the searched text
+        :param matches: number of matches found
+        :param seconds: time spent
+        :param invocations: number of invocations
+        :return: nothing
+        """
+        if name not in RegexRegistry.counters:
+            RegexRegistry.counters[name] = [0, 0, 0, 0.0]
+        counters = RegexRegistry.counters[name]
+        counters[INVOCATIONS] = counters[INVOCATIONS] + invocations
+        counters[SCANNED_BYTES] = counters[SCANNED_BYTES] + scanned_bytes
+        counters[MATCHES] = counters[MATCHES] + matches
+        counters[SECONDS] = counters[SECONDS] + seconds
+
+    @staticmethod
+    def findall(name, text):
+        """
+        This method applies re.findall of the given regex on the text and counts it
+        :param name: name of a registered regex
+        :param text: the text to search in
+        :return: list of matches (as re.findall)
+        """
+        start_time = time.time()
+        result = RegexRegistry.patterns[name].findall(text)
+        RegexRegistry.add_counters(name, len(text), len(result), time.time() - start_time)
+        return result
+
+    @staticmethod
+    def pop_counters():
+        """
+        Get the counters and reset them, used to collect the counters of the worker processes
+        :return: dictionary {name: [invocations, scanned_bytes, matches, seconds]}
+        """
+        counters = RegexRegistry.counters
+        RegexRegistry.counters = dict()
+        return counters
+
+    @staticmethod
+    def merge_counters(counters):
+        """
+        This method adds the given counters (e.g. of a worker process) to the counters
+        :param counters: dictionary {name: [invocations, scanned_bytes, matches, seconds]}
+        :return: nothing
+        """
+        for (name, values) in counters.items():
+            RegexRegistry.add_counters(name, values[SCANNED_BYTES], values[MATCHES], values[SECONDS],
+                                       invocations=values[INVOCATIONS])
+
+    @staticmethod
+    def dump_counters():
+        """
+        This method prints the counters of all the regex, the slowest first
+        :return: nothing
+        """
+        for (name, values) in sorted(RegexRegistry.counters.items(), key=lambda item: item[1][SECONDS],
+                                     reverse=True):
+            logger.info("Regex [%s]: %s invocations, %s bytes scanned, %s matches, %.3f seconds"
+                        % (name, values[INVOCATIONS], values[SCANNED_BYTES], values[MATCHES], values[SECONDS]))
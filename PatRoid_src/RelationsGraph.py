@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+from RelationsStore import RelationsStore
+from SymbolTable import SymbolTable
+
+#############
+# CONSTANTS #
+#############
+
+RELATIONS_KINDS = ["depends", "aggregation", "association", "inheritance"]
+
+
+class RelationsGraph(object):
+    """
+    This class holds the relations of the module as a graph,
+    for each relation kind it keeps the edges (ci, cj) sorted by ci and a copy of them sorted by cj,
+    so the sub-patterns can be found by joining on the classes related to a class,
+    the classes are kept as their ids in the symbol table of the graph
+    """
+    def __init__(self, symbol_table=None):
+        """
+        Constructor
+        :param symbol_table: SymbolTable of the classes names, a new table is used if not given
+        """
+        self.symbol_table = symbol_table if symbol_table is not None else SymbolTable()
+        self.edges = dict()
+        self.reversed_edges = dict()
+
+    @staticmethod
+    def from_xml_root(root, symbol_table=None):
+        """
+        Build the graph from the root node of the relations module (check CreateRelationsModule)
+        :param root: The XML root node
+        :param symbol_table: SymbolTable of the classes names, a new table is used if not given
+        :return: RelationsGraph object
+        """
+        graph = RelationsGraph(symbol_table)
+        for kind in RELATIONS_KINDS:
+            node = root.find(kind)
+            if node is not None:
+                relations_store = RelationsStore(graph.symbol_table)
+                for relation in node:
+                    relations_store.add_relation(relation.attrib.get("ci"), relation.attrib.get("cj"))
+                graph.add_relations(kind, relations_store)
+        return graph
+
+    @staticmethod
+    def from_relations(relations_by_kind, symbol_table=None):
+        """
+        Build the graph directly from the relations stores (check JavaFilesInfo), without the module file
+        :param relations_by_kind: dictionary {kind: RelationsStore}
+        :param symbol_table: SymbolTable the relations stores use, a new table is used if not given
+        :return: RelationsGraph object
+        """
+        graph = RelationsGraph(symbol_table)
+        for kind in RELATIONS_KINDS:
+            if kind in relations_by_kind:
+                graph.add_relations(kind, relations_by_kind[kind])
+        return graph
+
+    def add_relations(self, kind, relations_store):
+        """
+        Set the relations of the given kind
+        :param kind: depends, aggregation, association or inheritance
+        :param relations_store: RelationsStore of the relations (using the graph symbol table)
+        :return: nothing
+        """
+        self.edges[kind] = relations_store.sort()
+        self.reversed_edges[kind] = relations_store.get_reversed()
+
+    def has_relations(self, kind):
+        """
+        Check if the module defines the given relation kind
+        :param kind: depends, aggregation, association or inheritance
+        :return: True if the relation kind exists
+        """
+        return kind in self.edges
+
+    def get_edges(self, kind):
+        """
+        Get all the edges of the given relation kind
+        :param kind: depends, aggregation, association or inheritance
+        :return: RelationsStore (iterates over tuples [(ci, cj), ...])
+        """
+        return self.edges.get(kind, ())
+
+    def has_edge(self, kind, ci, cj):
+        """
+        Check if there is a relation of the given kind between ci and cj
+        :param kind: depends, aggregation, association or inheritance
+        :param ci: class i
+        :param cj: class j
+        :return: True if the relation exists
+        """
+        return kind in self.edges and self.edges[kind].has_relation(ci, cj)
+
+    def get_cj_of(self, kind, ci):
+        """
+        Get all the classes cj that have a relation of the given kind with ci
+        :param kind: depends, aggregation, association or inheritance
+        :param ci: class i
+        :return: list of classes
+        """
+        if kind not in self.edges:
+            return ()
+        return self.edges[kind].get_cj_of(ci)
+
+    def get_ci_of(self, kind, cj):
+        """
+        Get all the classes ci that have a relation of the given kind with cj
+        :param kind: depends, aggregation, association or inheritance
+        :param cj: class j
+        :return: list of classes
+        """
+        if kind not in self.reversed_edges:
+            return ()
+        return self.reversed_edges[kind].get_cj_of(cj)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import bisect
+from array import array
+from itertools import izip
+
+#################
+# Local Imports #
+#################
+
+
+#############
+# CONSTANTS #
+#############
+
+
+class RelationsStore(object):
+    """
+    This class keeps the relations of one kind as two parallel columns of the classes ids (ci and cj),
+    so each relation takes a couple of integers instead of a dictionary,
+    once all the relations are added the store is sorted (by ci then cj) and the repeated relations are removed,
+    then the classes related to a class are found by a binary search
+    """
+    def __init__(self, symbol_table):
+        """
+        Constructor
+        :param symbol_table: SymbolTable of the classes names
+        """
+        self.symbol_table = symbol_table
+        self.ci = array("i")
+        self.cj = array("i")
+        self.is_sorted = True
+
+    def __len__(self):
+        """
+        :return: Number of the relations
+        """
+        return len(self.ci)
+
+    def __iter__(self):
+        """
+        :return: iterator over the relations as tuples of classes ids (ci, cj)
+        """
+        return izip(self.ci, self.cj)
+
+    def add_relation(self, ci, cj):
+        """
+        Add the relation between the given classes
+        :param ci: class i name
+        :param cj: class j name
+        :return: nothing
+        """
+        self.ci.append(self.symbol_table.get_id(ci))
+        self.cj.append(self.symbol_table.get_id(cj))
+        self.is_sorted = False
+
+    def sort(self):
+        """
+        Sort the relations by ci then cj and remove the repeated ones
+        :return: the store itself
+        """
+        if not self.is_sorted:
+            relations = sorted(set(izip(self.ci, self.cj)))
+            self.ci = array("i", [ci for (ci, _) in relations])
+            self.cj = array("i", [cj for (_, cj) in relations])
+            self.is_sorted = True
+        return self
+
+    def get_reversed(self):
+        """
+        Get the relations with ci and cj swapped, sorted by cj then ci
+        :return: RelationsStore object
+        """
+        reversed_store = RelationsStore(self.symbol_table)
+        reversed_store.ci = array("i", self.cj)
+        reversed_store.cj = array("i", self.ci)
+        reversed_store.is_sorted = False
+        return reversed_store.sort()
+
+    def get_cj_of(self, ci):
+        """
+        Get all the classes cj related to ci, the store should be sorted
+        :param ci: class i id
+        :return: array of classes ids
+        """
+        start = bisect.bisect_left(self.ci, ci)
+        end = bisect.bisect_right(self.ci, ci, start)
+        return self.cj[start:end]
+
+    def has_relation(self, ci, cj):
+        """
+        Check if there is a relation between ci and cj, the store should be sorted
+        :param ci: class i id
+        :param cj: class j id
+        :return: True if the relation exists
+        """
+        start = bisect.bisect_left(self.ci, ci)
+        end = bisect.bisect_right(self.ci, ci, start)
+        index = bisect.bisect_left(self.cj, cj, start, end)
+        return index < end and self.cj[index] == cj
+
+    def get_relations(self):
+        """
+        Get all the relations by the classes names
+        :return: List of tuples [(ci, cj), ...]
+        """
+        get_name = self.symbol_table.get_name
+        return [(get_name(ci), get_name(cj)) for (ci, cj) in self]
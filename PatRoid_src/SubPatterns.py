@@ -11,6 +11,7 @@ import xml.etree.ElementTree as ET
 #################
 
 from ADPDException import ADPDException
+from RelationsGraph import RelationsGraph
 from Logger import Logger
 logger = Logger()
 
@@ -18,6 +19,12 @@ logger = Logger()
 # CONSTANTS #
 #############
 
+# All the sub-patterns in the order they are defined
+SUB_PATTERNS = ["ICA", "CI", "IAGG", "IPAG", "MLI", "IASS", "SAGG", "IIAGG", "SASS", "ICD", "DCI", "IPAS", "AGPI",
+                "IPD", "DPI"]
+# The sub-patterns which are used to find other sub-patterns {sub_pattern: [sub_patterns it uses]}
+SUB_PATTERNS_DEPENDENCIES = {"SASS": ["SAGG"]}
+
 
 class SubPatterns(object):
     """
@@ -25,20 +32,31 @@ class SubPatterns(object):
     then it uses the method to create the sub_patterns
     15 sub_patterns are implemented in this class
     """
-    def __init__(self, module_file):
+    def __init__(self, module_file=None, xml_root=None, relations_graph=None):
         """
         Constructor
+        :param module_file: The relations module XML file
+        :param xml_root: The root node of an already parsed relations module, the module_file is not parsed if given
+        :param relations_graph: RelationsGraph built in memory, the module is not needed to find the sub-patterns
+        the sub-patterns relations are tuples of the classes ids in the graph symbol table (check get_names)
         """
+        if module_file is None and xml_root is None and relations_graph is None:
+            raise ADPDException("Either a module file or a parsed module should be given to find the sub-patterns")
         self.module_file = module_file
+        self.xml_root = xml_root
+        self.relations_graph = relations_graph
+        self.sub_patterns_results = dict()
 
     def get_xml_root(self):
         """
-        parse xml
+        parse xml, the module is parsed only once and the root node is kept for the next calls
         :return: return the root node
         """
-        tree = ET.parse(self.module_file)
-        root = tree.getroot()
-        return root
+        if self.xml_root is None:
+            logger.info("Parsing the relations module: %s" % self.module_file)
+            tree = ET.parse(self.module_file)
+            self.xml_root = tree.getroot()
+        return self.xml_root
 
     def get_node_by_name(self, name):
         """
@@ -49,26 +67,82 @@ class SubPatterns(object):
         root = self.get_xml_root()
         return root.find(name)
 
-    def __ICA_helper(self, inh, ass):
+    def get_relations_graph(self):
+        """
+        Load the module relations into a graph indexed by ci and cj, the graph is built only once
+        :return: RelationsGraph object
+        """
+        if self.relations_graph is None:
+            self.relations_graph = RelationsGraph.from_xml_root(self.get_xml_root())
+        return self.relations_graph
+
+    def get_sub_pattern(self, name):
+        """
+        Find the relations of the given sub-pattern on demand, the sub-patterns it uses are found first,
+        each sub-pattern is found only once and kept for the next calls
+        :param name: sub-pattern name (check SUB_PATTERNS)
+        :return: list of tuples
+        """
+        if name not in self.sub_patterns_results:
+            if name not in SUB_PATTERNS:
+                raise ADPDException("Unknown sub-pattern: %s" % name)
+            for dependency in SUB_PATTERNS_DEPENDENCIES.get(name, list()):
+                self.get_sub_pattern(dependency)
+            self.sub_patterns_results[name] = getattr(self, name)()
+        return self.sub_patterns_results[name]
+
+    def get_names(self, value):
+        """
+        Resolve the classes ids in the given relations to the classes names
+        :param value: id, or a tuple, list or dictionary that contains ids
+        :return: the value with names instead of the ids
+        """
+        return self.get_relations_graph().symbol_table.get_names(value)
+
+    @staticmethod
+    def get_unique_relations(relations):
+        """
+        Remove the repeated relations, keeping the first of each in its place
+        :param relations: list of tuples
+        :return: list of tuples
+        """
+        found_relations = set()
+        unique_relations = list()
+        for relation in relations:
+            if relation not in found_relations:
+                found_relations.add(relation)
+                unique_relations.append(relation)
+        return unique_relations
+
+    @staticmethod
+    def log_relations_count(graph, kind):
+        """
+        Log the number of the relations of the given kind
+        :param graph: RelationsGraph object
+        :param kind: depends, aggregation, association or inheritance
+        :return: nothing
+        """
+        if graph.has_relations(kind):
+            logger.debug("%s: %s relations" % (kind, len(graph.get_edges(kind))))
+        else:
+            logger.debug("%s: None" % kind)
+
+    def __ICA_helper(self, graph):
         """
         This is a helper method for the ICA method
-        :param inh: inheritance node
-        :param ass: association node
+        :param graph: RelationsGraph object
         :return:
         """
         ica_relations = list()
-        if inh is None or ass is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("association"):
             logger.warning("There are no ICA relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in ass:
-                    if child == relation.attrib.get("cj"):
-                        ica_tuple = (parent, child, relation.attrib.get("ci"))
-                        ica_relations.append(ica_tuple)
-                        logger.debug("Found ICA: (%s, %s, %s)" % (ica_tuple[0], ica_tuple[1], ica_tuple[2]))
-        ica_relations = list(dict.fromkeys(ica_relations))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for associated in graph.get_ci_of("association", child):
+                    ica_tuple = (parent, child, associated)
+                    ica_relations.append(ica_tuple)
+                    logger.debug("Found ICA: (%s, %s, %s)" % self.get_names(ica_tuple))
+        ica_relations = self.get_unique_relations(ica_relations)
         return ica_relations
 
     def ICA(self):
@@ -78,50 +152,32 @@ class SubPatterns(object):
         """
         logger.info("ICA(Inheritance Child Association)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Association relation classes")
-        ass = self.get_node_by_name("association")
-        logger.debug("association: %s" % ass)
+        self.log_relations_count(graph, "association")
         logger.info("Step3: Find child classes with association relation")
-        return self.__ICA_helper(inh, ass)
+        return self.__ICA_helper(graph)
 
-    def __CI_helper(self, inh):
+    def __CI_helper(self, graph):
         """
         Helper for CI method
-        :param inh: inheritance
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_ci_relation = list()
-        if inh is None:
+        if not graph.has_relations("inheritance"):
             logger.info("There are no CI relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for inner_parent_and_child in inh:
-                    inner_parent = inner_parent_and_child.attrib.get("ci")
-                    inner_child = inner_parent_and_child.attrib.get("cj")
-                    if inner_parent == parent and inner_child != child:
-                        ci_tuple = (parent, child, inner_child)
+            for (parent, child) in graph.get_edges("inheritance"):
+                for sibling in graph.get_cj_of("inheritance", parent):
+                    if sibling != child:
+                        ci_tuple = (parent, child, sibling)
                         list_of_ci_relation.append(ci_tuple)
-                        logger.debug("Found CI: (%s, %s, %s)" % (ci_tuple[0], ci_tuple[1], ci_tuple[2]))
-        list_of_ci_relation = list(dict.fromkeys(list_of_ci_relation))
-        index = 0
-        while True:
-            if index == len(list_of_ci_relation):
-                break
-            for ci in list_of_ci_relation:
-                if index == len(list_of_ci_relation):
-                    break
-                if list_of_ci_relation[index] == ci:
-                    continue
-                # check if both parents are the same (index zero in tuple is for parent)
-                if ci[0] == list_of_ci_relation[index][0]:
-                    if sorted(ci) == sorted(list_of_ci_relation[index]):
-                        del list_of_ci_relation[index]
-                        index = 0
-                index = index + 1
+                        logger.debug("Found CI: (%s, %s, %s)" % self.get_names(ci_tuple))
+        # both orientations (parent, child1, child2) and (parent, child2, child1) are kept, the design patterns rules
+        # read the children by their position
+        list_of_ci_relation = self.get_unique_relations(list_of_ci_relation)
         return list_of_ci_relation
 
     def CI(self):
@@ -131,33 +187,27 @@ class SubPatterns(object):
         """
         logger.info("CI (Common Inheritance)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Find all children shares the same parent")
-        return self.__CI_helper(inh)
+        return self.__CI_helper(graph)
 
-    def __IAGG_helper(self, inh, agg):
+    def __IAGG_helper(self, graph):
         """
         Helper for IAGG method
-        :param inh: inheritance
-        :param agg: aggregation
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_iagg_relation = list()
-        if inh is None or agg is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("aggregation"):
             logger.info("There are no IAGG relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in agg:
-                    agg_relation_class_1 = relation.attrib.get("cj")
-                    agg_relation_class_2 = relation.attrib.get("ci")
-                    if agg_relation_class_1 == parent and agg_relation_class_2 == child:
-                        iagg_tuple = (parent, child)
-                        list_of_iagg_relation.append(iagg_tuple)
-                        logger.debug("Found IAGG: (%s, %s)" % (iagg_tuple[0], iagg_tuple[1]))
-        list_of_iagg_relation = list(dict.fromkeys(list_of_iagg_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                if graph.has_edge("aggregation", child, parent):
+                    iagg_tuple = (parent, child)
+                    list_of_iagg_relation.append(iagg_tuple)
+                    logger.debug("Found IAGG: (%s, %s)" % self.get_names(iagg_tuple[:2]))
+        list_of_iagg_relation = self.get_unique_relations(list_of_iagg_relation)
         return list_of_iagg_relation
 
     def IAGG(self):
@@ -167,36 +217,30 @@ class SubPatterns(object):
         """
         logger.info("IAGG (Inheritance AGGregation)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all classes with aggregation relation")
-        agg = self.get_node_by_name("aggregation")
-        logger.debug("aggregation: %s" % agg)
+        self.log_relations_count(graph, "aggregation")
         logger.info("Step3: Find classes that have both inheritance and aggregation")
-        return self.__IAGG_helper(inh, agg)
+        return self.__IAGG_helper(graph)
 
-    def __IPAG_helper(self, inh, agg):
+    def __IPAG_helper(self, graph):
         """
         Helper for IPAG method
-        :param inh: inheritance
-        :param agg: aggregation
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_ipag_relation = list()
-        if inh is None or agg is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("aggregation"):
             logger.info("There are no IPAG relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in agg:
-                    agg_relation_class_1 = relation.attrib.get("ci")
-                    agg_relation_class_2 = relation.attrib.get("cj")
-                    if agg_relation_class_1 == parent and agg_relation_class_2 != child:
-                        ipag_tuple = (parent, child, agg_relation_class_2)
+            for (parent, child) in graph.get_edges("inheritance"):
+                for aggregated in graph.get_cj_of("aggregation", parent):
+                    if aggregated != child:
+                        ipag_tuple = (parent, child, aggregated)
                         list_of_ipag_relation.append(ipag_tuple)
-                        logger.debug("Found IPAG: (%s, %s, %s)" % (ipag_tuple[0], ipag_tuple[1], ipag_tuple[2]))
-        list_of_ipag_relation = list(dict.fromkeys(list_of_ipag_relation))
+                        logger.debug("Found IPAG: (%s, %s, %s)" % self.get_names(ipag_tuple))
+        list_of_ipag_relation = self.get_unique_relations(list_of_ipag_relation)
         return list_of_ipag_relation
 
     def IPAG(self):
@@ -206,35 +250,29 @@ class SubPatterns(object):
         """
         logger.info("IPAG (Inheritance Parent AGgregation)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all classes with aggregation relation")
-        agg = self.get_node_by_name("aggregation")
-        logger.debug("aggregation: %s" % agg)
+        self.log_relations_count(graph, "aggregation")
         logger.info("Step3: Find classes that have inheritance and the parent have aggregation with other")
-        return self.__IPAG_helper(inh, agg)
+        return self.__IPAG_helper(graph)
 
-    def __MLI_helper(self, inh):
+    def __MLI_helper(self, graph):
         """
         Helper for MLI method
-        :param inh: inheritance
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_mli_relation = list()
-        if inh is None:
+        if not graph.has_relations("inheritance"):
             logger.info("There are no MLI relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for inner_parent_and_child in inh:
-                    inner_parent = inner_parent_and_child.attrib.get("ci")
-                    inner_child = inner_parent_and_child.attrib.get("cj")
-                    if inner_parent == child:
-                        mli_tuple = (parent, child, inner_child)
-                        list_of_mli_relation.append(mli_tuple)
-                        logger.debug("Found MLI: (%s, %s, %s)" % (mli_tuple[0], mli_tuple[1], mli_tuple[2]))
-        list_of_mli_relation = list(dict.fromkeys(list_of_mli_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for grandchild in graph.get_cj_of("inheritance", child):
+                    mli_tuple = (parent, child, grandchild)
+                    list_of_mli_relation.append(mli_tuple)
+                    logger.debug("Found MLI: (%s, %s, %s)" % self.get_names(mli_tuple))
+        list_of_mli_relation = self.get_unique_relations(list_of_mli_relation)
         return list_of_mli_relation
 
     def MLI(self):
@@ -244,31 +282,27 @@ class SubPatterns(object):
         """
         logger.info("MLI (Multi-Level Inheritance)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Find all classes that their parent is a child for other parent")
-        return self.__MLI_helper(inh)
+        return self.__MLI_helper(graph)
 
-    def __IASS_helper(self, inh, ass):
+    def __IASS_helper(self, graph):
         """
         Helper for IASS method
-        :param inh: inheritance
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_iass_relation = list()
-        if inh is None or ass is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("association"):
             logger.info("There are no IASS relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in ass:
-                    if child == relation.attrib.get("ci") and parent == relation.attrib.get("cj"):
-                        iass_tuple = (parent, child)
-                        list_of_iass_relation.append(iass_tuple)
-                        logger.debug("Found IASS: (%s, %s)" % (iass_tuple[0], iass_tuple[1]))
-        list_of_iass_relation = list(dict.fromkeys(list_of_iass_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                if graph.has_edge("association", child, parent):
+                    iass_tuple = (parent, child)
+                    list_of_iass_relation.append(iass_tuple)
+                    logger.debug("Found IASS: (%s, %s)" % self.get_names(iass_tuple[:2]))
+        list_of_iass_relation = self.get_unique_relations(list_of_iass_relation)
         return list_of_iass_relation
 
     def IASS(self):
@@ -278,29 +312,28 @@ class SubPatterns(object):
         """
         logger.info("IASS (Inheritance ASSociation)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Association relation classes")
-        ass = self.get_node_by_name("association")
-        logger.debug("association: %s" % ass)
-        return self.__IASS_helper(inh, ass)
+        self.log_relations_count(graph, "association")
+        return self.__IASS_helper(graph)
 
-    def __SAGG_helper(self, agg):
+    def __SAGG_helper(self, graph):
         """
         Helper for SAGG method
-        :param agg: aggregation
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_sagg_relation = list()
-        if agg is None:
+        if not graph.has_relations("aggregation"):
             logger.info("There are no SAGG relations")
         else:
-            for relation in agg:
-                if relation.attrib.get("ci") == relation.attrib.get("cj"):
-                    sagg_tuple = tuple()+ (relation.attrib.get("ci"), )
+            for (ci, cj) in graph.get_edges("aggregation"):
+                if ci == cj:
+                    sagg_tuple = (ci, )
                     list_of_sagg_relation.append(sagg_tuple)
-                    logger.debug("Found SAGG: (%s)" % (sagg_tuple[0]))
-            list_of_sagg_relation = list(dict.fromkeys(list_of_sagg_relation))
+                    logger.debug("Found SAGG: (%s)" % self.get_names(sagg_tuple))
+            list_of_sagg_relation = self.get_unique_relations(list_of_sagg_relation)
         return list_of_sagg_relation
 
     def SAGG(self):
@@ -310,35 +343,27 @@ class SubPatterns(object):
         """
         logger.info("SAGG (Self-Aggregation)")
         logger.info("Step1: Get all Aggregation relation classes")
-        agg = self.get_node_by_name("aggregation")
-        logger.debug("aggregation: %s" % agg)
-        return self.__SAGG_helper(agg)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "aggregation")
+        return self.__SAGG_helper(graph)
 
-    def __IIAGG_helper(self, inh, agg):
+    def __IIAGG_helper(self, graph):
         """
         Helper for IIAGG method
-        :param inh: inheritance
-        :param agg: aggregation
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_iiagg_relation = list()
-        if inh is None or agg is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("aggregation"):
             logger.info("There are no IIAGG relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for inner_parent_and_child in inh:
-                    inner_parent = inner_parent_and_child.attrib.get("ci")
-                    inner_child = inner_parent_and_child.attrib.get("cj")
-                    if inner_parent == child:
-                        for relation in agg:
-                            if inner_child == relation.attrib.get("ci") and parent == relation.attrib.get("cj"):
-                                iiagg_tuple = (parent, child, inner_child)
-                                list_of_iiagg_relation.append(iiagg_tuple)
-                                logger.debug("Found IIAGG: (%s, %s, %s)" % (iiagg_tuple[0], iiagg_tuple[1],
-                                                                            iiagg_tuple[2]))
-            list_of_iiagg_relation = list(dict.fromkeys(list_of_iiagg_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for grandchild in graph.get_cj_of("inheritance", child):
+                    if graph.has_edge("aggregation", grandchild, parent):
+                        iiagg_tuple = (parent, child, grandchild)
+                        list_of_iiagg_relation.append(iiagg_tuple)
+                        logger.debug("Found IIAGG: (%s, %s, %s)" % self.get_names(iiagg_tuple))
+            list_of_iiagg_relation = self.get_unique_relations(list_of_iiagg_relation)
         return list_of_iiagg_relation
 
     def IIAGG(self):
@@ -348,38 +373,32 @@ class SubPatterns(object):
         """
         logger.info("IIAGG (Indirect Inheritance AGGregation)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Aggregation relation classes")
-        agg = self.get_node_by_name("aggregation")
-        logger.debug("aggregation: %s" % agg)
-        return self.__IIAGG_helper(inh, agg)
+        self.log_relations_count(graph, "aggregation")
+        return self.__IIAGG_helper(graph)
 
-    def __SASS_helper(self, ass):
+    def __SASS_helper(self, graph):
         """
         Helper for SASS method
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_sass_relation = list()
-        if ass is None:
+        if not graph.has_relations("association"):
             logger.info("There are no SASS relations")
         else:
-            for relation in ass:
-                if relation.attrib.get("ci") == relation.attrib.get("cj"):
-                    sass_tuple = tuple() + (relation.attrib.get("ci"), )
+            for (ci, cj) in graph.get_edges("association"):
+                if ci == cj:
+                    sass_tuple = (ci, )
                     list_of_sass_relation.append(sass_tuple)
-                    logger.debug("Found SASS: (%s)" % (sass_tuple[0]))
-        list_of_sass_relation = list(dict.fromkeys(list_of_sass_relation))
-        index = 0
-        while True:
-            if list_of_sass_relation[index] in self.SAGG():
-                del list_of_sass_relation[index]
-                index = 0
-            else:
-                index = index + 1
-            if index == len(list_of_sass_relation):
-                break
+                    logger.debug("Found SASS: (%s)" % self.get_names(sass_tuple))
+        list_of_sass_relation = self.get_unique_relations(list_of_sass_relation)
+        # self-aggregation is not considered as self-association
+        sagg_relations = set(self.get_sub_pattern("SAGG"))
+        list_of_sass_relation = [sass_tuple for sass_tuple in list_of_sass_relation
+                                 if sass_tuple not in sagg_relations]
         return list_of_sass_relation
 
     def SASS(self):
@@ -389,29 +408,26 @@ class SubPatterns(object):
         """
         logger.info("SASS (Self-ASSociation)")
         logger.info("Step1: Get all Association relation classes")
-        ass = self.get_node_by_name("association")
-        logger.debug("association: %s" % ass)
-        return self.__SASS_helper(ass)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "association")
+        return self.__SASS_helper(graph)
 
-    def __ICD_helper(self, inh, dep):
+    def __ICD_helper(self, graph):
         """
         Helper for ICD method
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_ica_relation = list()
-        if inh is None or dep is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("depends"):
             logger.info("There are no ICD relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in dep:
-                    if relation.attrib.get("cj") == child:
-                        dci_tuple = (parent, child, relation.attrib.get("ci"))
-                        list_of_ica_relation.append(dci_tuple)
-                        logger.debug("Found ICD: (%s, %s, %s)" % (dci_tuple[0], dci_tuple[1], dci_tuple[2]))
-        list_of_ica_relation = list(dict.fromkeys(list_of_ica_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for dependent in graph.get_ci_of("depends", child):
+                    dci_tuple = (parent, child, dependent)
+                    list_of_ica_relation.append(dci_tuple)
+                    logger.debug("Found ICD: (%s, %s, %s)" % self.get_names(dci_tuple))
+        list_of_ica_relation = self.get_unique_relations(list_of_ica_relation)
         return list_of_ica_relation
 
     def ICD(self):
@@ -421,32 +437,28 @@ class SubPatterns(object):
         """
         logger.info("ICD (Inheritance Child Dependency)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Depends relation classes")
-        dep = self.get_node_by_name("depends")
-        logger.debug("depends: %s" % dep)
-        return self.__ICD_helper(inh, dep)
+        self.log_relations_count(graph, "depends")
+        return self.__ICD_helper(graph)
 
-    def __DCI_helper(self, inh, dep):
+    def __DCI_helper(self, graph):
         """
         Helper for DCI method
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_dci_relation = list()
-        if inh is None or dep is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("depends"):
             logger.info("There are no DCI relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in dep:
-                    if relation.attrib.get("ci") == child:
-                        icd_tuple = (parent, child,relation.attrib.get("cj"))
-                        list_of_dci_relation.append(icd_tuple)
-                        logger.debug("Found DCI: (%s, %s, %s)" % (icd_tuple[0], icd_tuple[1], icd_tuple[2]))
-        list_of_dci_relation = list(dict.fromkeys(list_of_dci_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for dependency in graph.get_cj_of("depends", child):
+                    icd_tuple = (parent, child, dependency)
+                    list_of_dci_relation.append(icd_tuple)
+                    logger.debug("Found DCI: (%s, %s, %s)" % self.get_names(icd_tuple))
+        list_of_dci_relation = self.get_unique_relations(list_of_dci_relation)
         return list_of_dci_relation
 
     def DCI(self):
@@ -456,33 +468,28 @@ class SubPatterns(object):
         """
         logger.info("DCI (Dependency Child Inheritance)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Depends relation classes")
-        dep = self.get_node_by_name("depends")
-        logger.debug("depends: %s" % dep)
-        return self.__DCI_helper(inh, dep)
+        self.log_relations_count(graph, "depends")
+        return self.__DCI_helper(graph)
 
-    def __IPAS_helper(self, inh, ass):
+    def __IPAS_helper(self, graph):
         """
         Helper for IPAS method
-        :param inh: inheritance
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_ipas_relation = list()
-        if inh is None or ass is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("association"):
             logger.info("There are no IPAS relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in ass:
-                    if parent == relation.attrib.get("cj"):
-                        ipas_tuple = (parent, child, relation.attrib.get("ci"))
-                        list_of_ipas_relation.append(ipas_tuple)
-                        logger.debug("Found IPAS: (%s, %s, %s)" % (ipas_tuple[0], ipas_tuple[1], ipas_tuple[2]))
-        list_of_ipas_relation = list(dict.fromkeys(list_of_ipas_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for associated in graph.get_ci_of("association", parent):
+                    ipas_tuple = (parent, child, associated)
+                    list_of_ipas_relation.append(ipas_tuple)
+                    logger.debug("Found IPAS: (%s, %s, %s)" % self.get_names(ipas_tuple))
+        list_of_ipas_relation = self.get_unique_relations(list_of_ipas_relation)
         return list_of_ipas_relation
 
     def IPAS(self):
@@ -492,33 +499,28 @@ class SubPatterns(object):
         """
         logger.info("IPAS (Inheritance Parent ASsociation)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Association relation classes")
-        ass = self.get_node_by_name("association")
-        logger.debug("association: %s" % ass)
-        return self.__IPAS_helper(inh, ass)
+        self.log_relations_count(graph, "association")
+        return self.__IPAS_helper(graph)
 
-    def __AGPI_helper(self, inh, agg):
+    def __AGPI_helper(self, graph):
         """
         Helper for AGPI method
-        :param inh: inheritance
-        :param agg: aggregation
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_agpi_relation = list()
-        if inh is None or agg is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("aggregation"):
             logger.info("There are no AGPI relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in agg:
-                    if parent == relation.attrib.get("cj"):
-                        agpi_tuple = (parent, child, relation.attrib.get("ci"))
-                        list_of_agpi_relation.append(agpi_tuple)
-                        logger.debug("Found AGPI: (%s, %s, %s)" % (agpi_tuple[0], agpi_tuple[1], agpi_tuple[2]))
-        list_of_agpi_relation = list(dict.fromkeys(list_of_agpi_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for aggregator in graph.get_ci_of("aggregation", parent):
+                    agpi_tuple = (parent, child, aggregator)
+                    list_of_agpi_relation.append(agpi_tuple)
+                    logger.debug("Found AGPI: (%s, %s, %s)" % self.get_names(agpi_tuple))
+        list_of_agpi_relation = self.get_unique_relations(list_of_agpi_relation)
         return list_of_agpi_relation
 
     def AGPI(self):
@@ -528,32 +530,28 @@ class SubPatterns(object):
         """
         logger.info("AGPI (AGgregation Parent Inherited)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Aggregation relation classes")
-        agg = self.get_node_by_name("aggregation")
-        logger.debug("aggregation: %s" % agg)
-        return self.__AGPI_helper(inh, agg)
+        self.log_relations_count(graph, "aggregation")
+        return self.__AGPI_helper(graph)
 
-    def __IPD_helper(self, inh, dep):
+    def __IPD_helper(self, graph):
         """
         Helper for IPD method
-        :param ass: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_ipd_relation = list()
-        if inh is None or dep is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("depends"):
             logger.info("There are no IPD relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in dep:
-                    if relation.attrib.get("cj") == parent:
-                        ipd_tuple = (parent, child, relation.attrib.get("ci"))
-                        list_of_ipd_relation.append(ipd_tuple)
-                        logger.debug("Found IPD: (%s, %s, %s)" % (ipd_tuple[0], ipd_tuple[1], ipd_tuple[2]))
-        list_of_ipd_relation = list(dict.fromkeys(list_of_ipd_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for dependent in graph.get_ci_of("depends", parent):
+                    ipd_tuple = (parent, child, dependent)
+                    list_of_ipd_relation.append(ipd_tuple)
+                    logger.debug("Found IPD: (%s, %s, %s)" % self.get_names(ipd_tuple))
+        list_of_ipd_relation = self.get_unique_relations(list_of_ipd_relation)
         return list_of_ipd_relation
 
     def IPD(self):
@@ -563,32 +561,28 @@ class SubPatterns(object):
         """
         logger.info("IPD (Inheritance Parent Dependency)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Depends relation classes")
-        dep = self.get_node_by_name("depends")
-        logger.debug("depends: %s" % dep)
-        return self.__IPD_helper(inh, dep)
+        self.log_relations_count(graph, "depends")
+        return self.__IPD_helper(graph)
 
-    def __DPI_helper(self, inh, dep):
+    def __DPI_helper(self, graph):
         """
         Helper for DPI method
-        :param dep: association
+        :param graph: RelationsGraph object
         :return: list of tuples
         """
         list_of_dpi_relation = list()
-        if inh is None or dep is None:
+        if not graph.has_relations("inheritance") or not graph.has_relations("depends"):
             logger.info("There are no DPI relations")
         else:
-            for parent_and_child in inh:
-                parent = parent_and_child.attrib.get("ci")
-                child = parent_and_child.attrib.get("cj")
-                for relation in dep:
-                    if relation.attrib.get("ci") == parent:
-                        dpi_tuple = (parent, child, relation.attrib.get("cj"))
-                        list_of_dpi_relation.append(dpi_tuple)
-                        logger.debug("Found DPI: (%s, %s, %s)" % (dpi_tuple[0], dpi_tuple[1], dpi_tuple[2]))
-        list_of_dpi_relation = list(dict.fromkeys(list_of_dpi_relation))
+            for (parent, child) in graph.get_edges("inheritance"):
+                for dependency in graph.get_cj_of("depends", parent):
+                    dpi_tuple = (parent, child, dependency)
+                    list_of_dpi_relation.append(dpi_tuple)
+                    logger.debug("Found DPI: (%s, %s, %s)" % self.get_names(dpi_tuple))
+        list_of_dpi_relation = self.get_unique_relations(list_of_dpi_relation)
         return list_of_dpi_relation
 
     def DPI(self):
@@ -598,9 +592,8 @@ class SubPatterns(object):
         """
         logger.info("DPI (Dependency Parent Inherited)")
         logger.info("Step1: Get all parent and child classes")
-        inh = self.get_node_by_name("inheritance")
-        logger.debug("inheritance: %s" % inh)
+        graph = self.get_relations_graph()
+        self.log_relations_count(graph, "inheritance")
         logger.info("Step2: Get all Depends relation classes")
-        dep = self.get_node_by_name("depends")
-        logger.debug("depends: %s" % dep)
-        return self.__DPI_helper(inh, dep)
+        self.log_relations_count(graph, "depends")
+        return self.__DPI_helper(graph)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+
+#################
+# Local Imports #
+#################
+
+
+#############
+# CONSTANTS #
+#############
+
+
+class SymbolTable(object):
+    """
+    This class maps the classes names in the project to dense integer ids,
+    so the relations, the sub-patterns and the design patterns are found on integers,
+    and the names are resolved only when they are printed,
+    the classes are given their ids in the names order, so the ids (and the order of the found relations and
+    patterns) don't depend on the order the java files were found in
+    """
+    def __init__(self, classes=None):
+        """
+        Constructor
+        :param classes: The project classes names (check JavaFilesInfo.get_list_of_classes_names)
+        """
+        # id 0 is not used, so the ids are never false (as the names)
+        self.names = [None]
+        self.ids = dict()
+        for class_name in sorted(set(classes or list())):
+            self.get_id(class_name)
+        self.classes_count = len(self.names) - 1
+
+    def __len__(self):
+        """
+        :return: Number of the names in the table
+        """
+        return len(self.names) - 1
+
+    def get_id(self, name):
+        """
+        Get the id of the given name, the name is added to the table if it is not in it
+        :param name: class name
+        :return: integer id
+        """
+        symbol_id = self.ids.get(name)
+        if symbol_id is None:
+            symbol_id = len(self.names)
+            self.ids[name] = symbol_id
+            self.names.append(name)
+        return symbol_id
+
+    def get_name(self, symbol_id):
+        """
+        Get the name of the given id
+        :param symbol_id: integer id
+        :return: class name
+        """
+        return self.names[symbol_id]
+
+    def __contains__(self, name):
+        """
+        Check if the given name is one of the project classes the table was built from
+        :param name: class name
+        :return: True if the name is a project class
+        """
+        return 0 < self.ids.get(name, 0) <= self.classes_count
+
+    def get_names(self, value):
+        """
+        Replace the ids in the given value by their names
+        :param value: id, or a tuple, list or dictionary (values only) that contains ids
+        :return: the value with names instead of the ids
+        """
+        if isinstance(value, int):
+            return self.names[value]
+        if isinstance(value, tuple):
+            return tuple([self.get_names(item) for item in value])
+        if isinstance(value, list):
+            return [self.get_names(item) for item in value]
+        if isinstance(value, dict):
+            return dict([(key, self.get_names(item)) for (key, item) in value.items()])
+        return value
@@ -12,17 +12,22 @@ import re
 
 from ADPDException import ADPDException
 from Common import CommonMethods
+from JavaLexer import JavaLexer
+from JavaMethodsScanner import JavaMethodsScanner
+from JavaTokensScanner import JavaTokensScanner
+from RegexRegistry import RegexRegistry
 
 #############
 # CONSTANTS #
 #############
 
-METHODS_REGEX = r"((?:(?:public|private|protected|static|final|abstract|synchronized|volatile)\s+)*)\s*(\w+)\s+(\w+)" \
-                    "\(([\w|\s|,|@]*)\)\s*({(?:{[^{}]*(?:{[^{}]*}|.)*?[^{}]*}|.)*?})[^;]"
-OBJECTS_DEFINITION_REGEX = r"(\w*)\s*(\w+)\[{0,1}\]{0,1}\s+(\w+)\s*=.*?;"
-CLASS_NAME_AND_PARENT_REGEX = r"class\s+(\w+)(?:\s+extends\s+(\w+))*"
-STATIC_METHOD_CALL_REGEX = r"(\w+)\.\w+\(.*\);"
 CLASS_NAME_FROM_PATH = r"(\w+)\.java"
+IDENTIFIER_REGEX = r"\w+"
+REGISTERED_REGEX = [("CLASS_NAME_FROM_PATH", CLASS_NAME_FROM_PATH, re.DOTALL),
+                    ("IDENTIFIER_REGEX", IDENTIFIER_REGEX, 0)]
+
+for (regex_name, regex, regex_flags) in REGISTERED_REGEX:
+    RegexRegistry.register(regex_name, regex, regex_flags)
 
 
 class RegexHandler(object):
@@ -31,19 +36,26 @@ class RegexHandler(object):
     Each regex should have its own method that takes file_path or a string
     and returns a group of matches for that regex
     The methods need to use the common methods (get_search_in_text, apply_regex)
+    The java sources are searched after the lexer stage (check JavaLexer), so nothing is matched in the comments
+    and the literals, the last lexed text (and its tokens) is kept since all the facts of a file are extracted from
+    the same text
     """
+    last_lexed_text = (None, None)
+    last_tokens_scanner = (None, None)
+
     def __init__(self):
         """
         Constructor
         """
         pass
 
-    def get_search_in_text(self, file_path=None, string=None):
+    def get_search_in_text(self, file_path=None, string=None, java_source=True):
         """
         This method is a common method to be called by all apply regex methods
         It prepare the search in string.
         :param file_path: File path to search in
         :param string: String to search in
+        :param java_source: True if the text is a java source, its comments and literals are blanked
         :return: Text
         """
         search_in = string
@@ -51,8 +63,29 @@ class RegexHandler(object):
             search_in = CommonMethods.read_file(file_path=file_path)
         if not search_in:
             raise ADPDException("To apply a regex you have to provide either a file or a string")
+        if java_source:
+            (text, lexed_text) = RegexHandler.last_lexed_text
+            if text is not search_in:
+                lexed_text = JavaLexer(search_in).blank_comments_and_literals()
+                RegexHandler.last_lexed_text = (search_in, lexed_text)
+            search_in = lexed_text
         return search_in
 
+    def get_tokens_scanner(self, file_path=None, string=None):
+        """
+        This method prepares the JavaTokensScanner of the given (file or string), the scanner of the last lexed text
+        is kept, so the methods and the other facts of a file are extracted from the same tokens
+        :param file_path: File to scan
+        :param string: String to scan
+        :return: JavaTokensScanner object
+        """
+        search_in_text = self.get_search_in_text(file_path=file_path, string=string)
+        (text, tokens_scanner) = RegexHandler.last_tokens_scanner
+        if text is not search_in_text:
+            tokens_scanner = JavaTokensScanner(search_in_text)
+            RegexHandler.last_tokens_scanner = (search_in_text, tokens_scanner)
+        return tokens_scanner
+
     def apply_regex(self, search_in_text, regex_ptrn, flags=re.DOTALL):
         """
         This method is a common method to be called in all apply regex methods
@@ -62,72 +95,103 @@ class RegexHandler(object):
         :return: re.findall object
         """
         try:
-            result = re.findall(regex_ptrn, search_in_text, flags)
+            result = RegexRegistry.findall(RegexRegistry.get_name(regex_ptrn, flags), search_in_text)
+        except ADPDException:
+            raise
         except Exception as exp:
             raise ADPDException(exp)
         return result
 
-    def apply_methods_regex(self, file_path=None, string=None):
+    def apply_methods_regex(self, file_path=None, string=None, parse_budget=None):
         """
-        This method take the given (file or string) and apply the regex METHODS_REGEX
-        :param file_path: File to search for regex in
-        :param string: String to search for regex in
-        :return: re.findall object [(access_modifier, return_type, name, arguments, body),...]
+        This method take the given (file or string) and extract its methods using the JavaMethodsScanner,
+        the scanner matches the methods signatures on the tokens and walks the braces once, so the cost is linear
+        :param file_path: File to search for methods in
+        :param string: String to search for methods in
+        :param parse_budget: ParseBudget of the file, the scan stops if its time budget is over (None for no budget)
+        :return: list of tuples [(access_modifier, return_type, name, arguments, (body_start, body_end)),...]
         """
-        search_in_text = self.get_search_in_text(file_path=file_path, string=string)
-        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=METHODS_REGEX)
+        tokens_scanner = self.get_tokens_scanner(file_path=file_path, string=string)
+        try:
+            result = JavaMethodsScanner(tokens_scanner.text, parse_budget=parse_budget,
+                                        tokens_scanner=tokens_scanner).scan()
+        except ADPDException:
+            raise
+        except Exception as exp:
+            raise ADPDException(exp)
         if result is None:
             raise ADPDException("Couldn't apply the method pattern, nothing was found")
         return result
 
-    def apply_object_definition_regex(self, file_path=None, string=None):
+    def apply_methods_signatures_regex(self, file_path=None, string=None):
         """
-        This method take the given (file or string) and apply the regex OBJECTS_DEFINITION_REGEX
-        :param file_path: File to search for regex in
-        :param string: String to search for regex in
-        :return: re.findall object
+        This method take the given (file or string) and extract only its methods signatures (without the bodies)
+        using the JavaMethodsScanner, it is the cheap fallback of apply_methods_regex
+        :param file_path: File to search for methods in
+        :param string: String to search for methods in
+        :return: list of tuples [(access_modifier, return_type, name, arguments, None),...]
         """
-        search_in_text = self.get_search_in_text(file_path=file_path, string=string)
-        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=OBJECTS_DEFINITION_REGEX)
+        tokens_scanner = self.get_tokens_scanner(file_path=file_path, string=string)
+        try:
+            result = JavaMethodsScanner(tokens_scanner.text, tokens_scanner=tokens_scanner).scan_signatures()
+        except Exception as exp:
+            raise ADPDException(exp)
         if result is None:
-            raise ADPDException("Couldn't apply the object definition pattern, nothing was found")
+            raise ADPDException("Couldn't apply the method signature pattern, nothing was found")
         return result
 
-    def apply_class_name_and_parent_regex(self, file_path=None, string=None):
+    def apply_tokens_scanner(self, file_path=None, string=None):
         """
-        This method take the given (file or string) and apply the regex CLASS_NAME_AND_PARENT_REGEX
-        :param file_path: File to search for regex in
-        :param string: String to search for regex in
-        :return: re.findall object
+        This method take the given (file or string) and extract its classes headers, fields declarations and
+        static methods calls in one tokens sweep using the JavaTokensScanner
+        :param file_path: File to scan
+        :param string: String to scan
+        :return: tuple of lists ([(class_name, parent), ...], [(modifier, data_type, name), ...], [class_name])
         """
-        search_in_text = self.get_search_in_text(file_path=file_path, string=string)
-        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=CLASS_NAME_AND_PARENT_REGEX)
-        if result is None:
-            raise ADPDException("Couldn't apply the class name and parent pattern, nothing was found")
+        tokens_scanner = self.get_tokens_scanner(file_path=file_path, string=string)
+        try:
+            result = tokens_scanner.scan()
+        except Exception as exp:
+            raise ADPDException(exp)
         return result
 
-    def apply_static_method_call_regex(self, file_path=None, string=None):
+    def apply_classes_headers_scanner(self, file_path=None, string=None):
         """
-        This method take the given (file or string) and apply the regex STATIC_METHOD_CALL_REGEX
+        This method take the given (file or string) and extract only its classes headers using the
+        JavaTokensScanner, it is used by the cheap fallback of the facts extraction
+        :param file_path: File to scan
+        :param string: String to scan
+        :return: list of tuples [(class_name, parent), ...]
+        """
+        tokens_scanner = self.get_tokens_scanner(file_path=file_path, string=string)
+        try:
+            result = tokens_scanner.find_classes_headers()
+        except Exception as exp:
+            raise ADPDException(exp)
+        return result
+
+    def apply_class_name_from_path_regex(self, file_path=None, string=None):
+        """
+        This method take the given (file or string) and apply the regex CLASS_NAME_FROM_PATH
         :param file_path: File to search for regex in
         :param string: String to search for regex in
         :return: re.findall object
         """
-        search_in_text = self.get_search_in_text(file_path=file_path, string=string)
-        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=STATIC_METHOD_CALL_REGEX)
+        search_in_text = self.get_search_in_text(file_path=file_path, string=string, java_source=False)
+        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=CLASS_NAME_FROM_PATH)
         if result is None:
             raise ADPDException("Couldn't apply the class name and parent pattern, nothing was found")
         return result
 
-    def apply_class_name_from_path_regex(self, file_path=None, string=None):
+    def apply_identifier_regex(self, file_path=None, string=None):
         """
-        This method take the given (file or string) and apply the regex CLASS_NAME_FROM_PATH
+        This method take the given (file or string) and apply the regex IDENTIFIER_REGEX
         :param file_path: File to search for regex in
         :param string: String to search for regex in
         :return: re.findall object
         """
         search_in_text = self.get_search_in_text(file_path=file_path, string=string)
-        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=CLASS_NAME_FROM_PATH)
+        result = self.apply_regex(search_in_text=search_in_text, regex_ptrn=IDENTIFIER_REGEX, flags=0)
         if result is None:
-            raise ADPDException("Couldn't apply the class name and parent pattern, nothing was found")
+            raise ADPDException("Couldn't apply the identifier pattern, nothing was found")
         return result
\ No newline at end of file
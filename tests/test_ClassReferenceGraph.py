@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "PatRoid_src"))
+
+#################
+# Local Imports #
+#################
+
+from ClassReferenceGraph import ClassReferenceGraph
+
+#############
+# CONSTANTS #
+#############
+
+# class name: the classes mentioned in its file
+CYCLIC_CLASSES = {"Main": ["Home", "Settings"],
+                  "Home": ["Feed", "Profile"],
+                  "Feed": ["Post", "Home"],
+                  "Post": ["Feed", "Comment"],
+                  "Comment": [],
+                  "Profile": ["Avatar"],
+                  "Avatar": ["Profile", "Comment"],
+                  "Settings": ["Settings"],
+                  "Unused": ["Main"]}
+ACYCLIC_CLASSES = {"Main": ["Home", "Settings"],
+                   "Home": ["Feed", "Profile"],
+                   "Feed": ["Post"],
+                   "Post": ["Comment"],
+                   "Comment": [],
+                   "Profile": ["Comment"],
+                   "Settings": [],
+                   "Unused": ["Main"]}
+
+
+class TestFindComponents(unittest.TestCase):
+    """
+    This class tests the strongly connected components found by ClassReferenceGraph.find_components,
+    and the classes reachable from them, against a naive reachability
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_graph(self, classes_references):
+        """
+        Write a java file for each class, which mentions the given classes, and build their graph
+        :param classes_references: dictionary {class_name: [mentioned class_name, ...]}
+        :return: ClassReferenceGraph object
+        """
+        java_files = list()
+        for (class_name, references) in sorted(classes_references.items()):
+            java_file = os.path.join(self.directory, "%s.java" % class_name)
+            with open(java_file, "w") as file_handler:
+                file_handler.write("public class %s {\n" % class_name)
+                for reference in references:
+                    file_handler.write("    private %s field%s;\n" % (reference, reference))
+                file_handler.write("}\n")
+            java_files.append(java_file)
+        return ClassReferenceGraph(java_files, sorted(classes_references))
+
+    @staticmethod
+    def get_naive_reach(graph, node):
+        """
+        Find the classes reachable from the given class (by at least one reference) by walking the graph
+        :param graph: ClassReferenceGraph object
+        :param node: class index
+        :return: set of the reachable classes indexes
+        """
+        reach = set()
+        stack = list(graph.references[node])
+        while stack:
+            reference = stack.pop()
+            if reference not in reach:
+                reach.add(reference)
+                stack.extend(graph.references[reference])
+        return reach
+
+    def check_graph(self, graph):
+        """
+        Check the components and the related classes of the graph against the naive reachability
+        :param graph: ClassReferenceGraph object
+        """
+        nodes = range(len(graph.classes))
+        reach = [self.get_naive_reach(graph, node) for node in nodes]
+        self.assertEqual(sorted([member for component in graph.components for member in component]), list(nodes))
+        for first in nodes:
+            for second in nodes:
+                same_component = first == second or (second in reach[first] and first in reach[second])
+                self.assertEqual(graph.classes_components[first] == graph.classes_components[second],
+                                 same_component, (graph.classes[first], graph.classes[second]))
+                if second in graph.references[first]:
+                    # reverse topological order, a referenced component is found before the referencing one
+                    self.assertTrue(graph.classes_components[second] <= graph.classes_components[first])
+        for node in nodes:
+            related_classes = [graph.classes[reference] for reference in sorted(reach[node])]
+            self.assertEqual(graph.get_related_classes(graph.classes[node]), related_classes)
+
+    def test_cyclic_graph(self):
+        graph = self.create_graph(CYCLIC_CLASSES)
+        self.check_graph(graph)
+        components = sorted([sorted([graph.classes[member] for member in component])
+                             for component in graph.components])
+        self.assertEqual(components, [["Avatar", "Profile"], ["Comment"], ["Feed", "Home", "Post"], ["Main"],
+                                      ["Settings"], ["Unused"]])
+        self.assertEqual(graph.get_related_classes("Post"),
+                         ["Avatar", "Comment", "Feed", "Home", "Post", "Profile"])
+
+    def test_acyclic_graph(self):
+        graph = self.create_graph(ACYCLIC_CLASSES)
+        self.check_graph(graph)
+        self.assertEqual(len(graph.components), len(ACYCLIC_CLASSES))
+        # the file of a class mentions the class itself (in its header), so it is related to itself
+        self.assertEqual(graph.get_related_classes("Home"), ["Comment", "Feed", "Home", "Post", "Profile"])
+
+    def test_files_mentioning(self):
+        graph = self.create_graph(CYCLIC_CLASSES)
+        for class_name in CYCLIC_CLASSES:
+            mentioning = sorted(os.path.basename(java_file)[:-len(".java")] for java_file
+                                in graph.classes_scanner.get_files_mentioning(class_name))
+            expected = sorted(other for (other, references) in CYCLIC_CLASSES.items()
+                              if other == class_name or class_name in references)
+            self.assertEqual(mentioning, expected, class_name)
+        self.assertEqual(graph.classes_scanner.get_files_mentioning("Missing"), list())
+
+
+if __name__ == "__main__":
+    unittest.main()
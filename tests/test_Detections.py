@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+import re
+import ast
+import sys
+import json
+import shutil
+import zipfile
+import tempfile
+import unittest
+import subprocess
+
+#################
+# Local Imports #
+#################
+
+
+#############
+# CONSTANTS #
+#############
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PATROID = os.path.join(TESTS_DIR, os.pardir, "PatRoid_src", "PatRoid.py")
+EVALUATION_DIR = os.path.join(TESTS_DIR, os.pardir, "Full Evaluation Results")
+EVALUATION_ARCHIVE = "android-SharingShortcuts.zip"
+# the design patterns detected on the evaluation projects by the original implementation (before the performance
+# work), {project: {pattern: [{sub_pattern: [classes names]}, ...]}}
+BASELINE_DETECTIONS = os.path.join(TESTS_DIR, "data", "baseline_detections.json")
+DETECTION_REGEX = r"Design Pattern \[(\w+)\] is found in: (.*)$"
+NUMBERED_SUB_PATTERN_REGEX = r"[A-Z]+\d+$"
+# the baseline instances which are not detected any more {project: {pattern: [instance, ...]}},
+# an adapter is an ICA with no CI on the same classes, the baseline found the CI relations in both orientations
+# ((parent, child1, child2) and (parent, child2, child1)) but removed some of them depending on the files order,
+# here it removed ("Subject", "Proxy", "RealSubject"), both orientations are always kept now
+NOT_DETECTED = {"Proxy": {"adapter": [{"ICA": ["Subject", "Proxy", "RealSubject"]}]}}
+
+
+class TestDetections(unittest.TestCase):
+    """
+    This class runs PatRoid on the evaluation projects and compares the design patterns it detects with the
+    baseline ones
+    """
+    @classmethod
+    def setUpClass(cls):
+        with open(BASELINE_DETECTIONS) as baseline_file:
+            cls.baseline = json.load(baseline_file)
+
+    @staticmethod
+    def detect(project_path):
+        """
+        Run PatRoid on the given project
+        :param project_path: project directory or archive
+        :return: dictionary {pattern: [instance, ...]}
+        """
+        working_dir = tempfile.mkdtemp()
+        try:
+            process = subprocess.Popen([sys.executable, PATROID, "-p", project_path, "-m", "module.xml",
+                                        "--no-module-file", "--no-cache"], cwd=working_dir, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT)
+            output = process.communicate()[0].decode("utf-8")
+        finally:
+            shutil.rmtree(working_dir)
+        if process.returncode != 0:
+            raise AssertionError("PatRoid failed on %s:\n%s" % (project_path, output))
+        detections = dict()
+        for line in output.splitlines():
+            match = re.search(DETECTION_REGEX, line)
+            if match:
+                detections[match.group(1)] = ast.literal_eval(match.group(2))
+        return detections
+
+    @staticmethod
+    def normalize(instance):
+        """
+        Get a comparable form of the given design pattern instance, the numbered sub-patterns (ICD0, ICD1, ...) are
+        numbered in the order they were found, so only their relations are kept
+        :param instance: dictionary {sub_pattern: [classes names]}
+        :return: tuple
+        """
+        named = sorted((name, tuple(classes)) for (name, classes) in instance.items()
+                       if not re.match(NUMBERED_SUB_PATTERN_REGEX, name))
+        numbered = sorted(tuple(classes) for (name, classes) in instance.items()
+                          if re.match(NUMBERED_SUB_PATTERN_REGEX, name))
+        return tuple(named), tuple(numbered)
+
+    def compare_with_baseline(self, project, detections):
+        """
+        Compare the given detections of the project with the baseline ones
+        :param project: evaluation project name
+        :param detections: dictionary {pattern: [instance, ...]}
+        :return: list of the differences descriptions
+        """
+        differences = list()
+        baseline = self.baseline[project]
+        if sorted(detections) != sorted(baseline):
+            differences.append("%s: detected %s, baseline %s" % (project, sorted(detections), sorted(baseline)))
+        for pattern in sorted(set(detections) | set(baseline)):
+            found = set(self.normalize(instance) for instance in detections.get(pattern, list()))
+            expected = set(self.normalize(instance) for instance in baseline.get(pattern, list()))
+            not_detected = set(self.normalize(instance) for instance
+                               in NOT_DETECTED.get(project, dict()).get(pattern, list()))
+            for instance in sorted(expected - found - not_detected):
+                differences.append("%s: %s lost %s" % (project, pattern, instance))
+            for instance in sorted(found - expected):
+                # both orientations of the CI relations are kept, so only the patterns that use CI find more
+                if "CI" not in dict(instance[0]):
+                    differences.append("%s: %s added %s" % (project, pattern, instance))
+        return differences
+
+    def test_evaluation_archives(self):
+        differences = list()
+        for project in sorted(self.baseline):
+            archive = os.path.join(EVALUATION_DIR, project, EVALUATION_ARCHIVE)
+            differences.extend(self.compare_with_baseline(project, self.detect(archive)))
+        self.assertEqual(differences, list(), "\n".join(differences))
+
+    def test_evaluation_directories(self):
+        # the files are written in the reverse order of the archive, so they are walked in another order
+        differences = list()
+        for project in sorted(self.baseline):
+            project_dir = tempfile.mkdtemp()
+            try:
+                with zipfile.ZipFile(os.path.join(EVALUATION_DIR, project, EVALUATION_ARCHIVE)) as archive:
+                    for member in reversed(archive.namelist()):
+                        archive.extract(member, project_dir)
+                differences.extend(self.compare_with_baseline(project, self.detect(project_dir)))
+            finally:
+                shutil.rmtree(project_dir)
+        self.assertEqual(differences, list(), "\n".join(differences))
+
+
+if __name__ == "__main__":
+    unittest.main()
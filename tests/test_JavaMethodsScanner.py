@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "PatRoid_src"))
+
+#################
+# Local Imports #
+#################
+
+from JavaLexer import JavaLexer
+from JavaMethodsScanner import JavaMethodsScanner
+
+
+class TestGetBodyEnd(unittest.TestCase):
+    """
+    This class tests where JavaMethodsScanner.get_body_end ends the bodies
+    """
+    @staticmethod
+    def get_body_end(text, body_start=None):
+        """
+        Find the braces of the given text (after the lexer stage) and the end of its body
+        :param text: java source
+        :param body_start: index of the opening brace of the body (default: the first brace)
+        :return: index of the closing brace of the body, or -1 if the body is not closed
+        """
+        scanner = JavaMethodsScanner(JavaLexer(text).blank_comments_and_literals())
+        scanner.find_braces()
+        return scanner.get_body_end(text.index("{") if body_start is None else body_start)
+
+    def test_nested_blocks(self):
+        text = "void run() { if (a) { while (b) { c(); } } else { d(); } }\n"
+        self.assertEqual(self.get_body_end(text), text.rindex("}"))
+
+    def test_inner_block_is_its_own_body(self):
+        text = "void run() { if (a) { c(); } d(); }\n"
+        inner_start = text.index("{", text.index("if"))
+        self.assertEqual(self.get_body_end(text, inner_start), text.index("}"))
+
+    def test_anonymous_class(self):
+        text = "void run() { task = new Runnable() { public void run() { c(); } }; post(task); }\n"
+        self.assertEqual(self.get_body_end(text), text.rindex("}"))
+
+    def test_closing_brace_followed_by_semicolon(self):
+        # the body doesn't end by "};", it continues (skipping the inner blocks) to the next closing brace
+        text = "{ a(); }; { b(); } c(); }\n"
+        self.assertEqual(self.get_body_end(text), text.rindex("}"))
+
+    def test_unclosed_body(self):
+        self.assertEqual(self.get_body_end("void run() { if (a) { c(); }\n"), -1)
+
+    def test_body_ended_only_by_semicolon(self):
+        self.assertEqual(self.get_body_end("{ a(); };\n"), -1)
+        self.assertEqual(self.get_body_end("{ a(); }"), -1)
+
+    def test_extra_closing_braces(self):
+        text = "void run() { c(); } } }\n"
+        self.assertEqual(self.get_body_end(text), text.index("}"))
+
+    def test_braces_inside_literals_and_comments(self):
+        text = "void run() {\n" \
+               "    s = \"} {\";\n" \
+               "    t = \"\\\"}\";\n" \
+               "    c = '}';\n" \
+               "    o = '{';\n" \
+               "    // }\n" \
+               "    /* { } } */\n" \
+               "}\n"
+        self.assertEqual(self.get_body_end(text), text.rindex("}"))
+
+
+class TestScan(unittest.TestCase):
+    """
+    This class tests the methods signatures and bodies found by JavaMethodsScanner.scan and scan_signatures
+    """
+    TEXT = "public class Main {\n" \
+           "    public static final int count(int a, String b) { return a; }\n" \
+           "    void run() { post(new Runnable() { public void run() { c(); } }); }\n" \
+           "    @Override protected void onStop() {\n" \
+           "        stop();\n"
+
+    def test_methods(self):
+        text = TestScan.TEXT
+        methods = JavaMethodsScanner(text).scan()
+        self.assertEqual([method[:4] for method in methods],
+                         [("public static final ", "int", "count", "int a, String b"), ("", "void", "run", "")])
+        # the bodies are the offsets from the opening brace to the closing brace, the anonymous class method is
+        # inside the run body, and the onStop body is not closed
+        count_body = (text.index("{ return"), text.index("}", text.index("return")) + 1)
+        run_body = (text.index("{ post"), text.index("}\n", text.index("post")) + 1)
+        self.assertEqual([method[4] for method in methods], [count_body, run_body])
+
+    def test_signatures(self):
+        # "new Runnable() {" is taken as a signature too, as the regex the scanner replaced took it
+        signatures = JavaMethodsScanner(TestScan.TEXT).scan_signatures()
+        self.assertEqual(signatures, [("public static final ", "int", "count", "int a, String b", None),
+                                      ("", "void", "run", "", None), ("", "new", "Runnable", "", None),
+                                      ("public ", "void", "run", "", None),
+                                      ("protected ", "void", "onStop", "", None)])
+
+    def test_not_a_signature(self):
+        text = "void run() { if (a) { b(); } for (int i, j) { c(); } }\n"
+        methods = JavaMethodsScanner(text).scan()
+        self.assertEqual(methods, [("", "void", "run", "", (text.index("{"), len(text) - 1))])
+
+
+if __name__ == "__main__":
+    unittest.main()
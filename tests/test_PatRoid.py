@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+##################
+# Python Imports #
+##################
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+#################
+# Local Imports #
+#################
+
+
+#############
+# CONSTANTS #
+#############
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PATROID = os.path.join(TESTS_DIR, os.pardir, "PatRoid_src", "PatRoid.py")
+
+
+class TestArguments(unittest.TestCase):
+    """
+    This class tests that PatRoid reports the wrong command line arguments as errors
+    """
+    def setUp(self):
+        self.working_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.working_dir)
+
+    def run_patroid(self, arguments):
+        """
+        Run PatRoid with the given arguments
+        :param arguments: list of command line arguments
+        :return: tuple (rc, output)
+        """
+        process = subprocess.Popen([sys.executable, PATROID] + arguments, cwd=self.working_dir,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output = process.communicate()[0].decode("utf-8")
+        return process.returncode, output
+
+    def check_error(self, arguments, error):
+        """
+        Check that PatRoid fails on the given arguments with the given error, and without a traceback
+        :param arguments: list of command line arguments
+        :param error: expected start of the error message
+        """
+        for debug_arguments in ([], ["-d"]):
+            (rc, output) = self.run_patroid(arguments + debug_arguments + ["-m", "module.xml"])
+            self.assertEqual(rc, 1, output)
+            self.assertIn("-E- %s" % error, output)
+            self.assertNotIn("Traceback", output)
+
+    def test_unknown_pattern(self):
+        self.check_error(["--patterns", "singleton,foo"], "Unknown design patterns: foo,")
+
+    def test_negative_jobs(self):
+        self.check_error(["--jobs", "-1"], "Number of jobs can't be negative")
+
+    def test_cache_size(self):
+        self.check_error(["--cache-size", "0"], "Cache size should be a positive number of MB")
+
+    def test_negative_parse_budget(self):
+        self.check_error(["--max-file-size", "-1"], "Java file parse budget can't be negative")
+        self.check_error(["--max-file-seconds", "-1"], "Java file parse budget can't be negative")
+
+
+if __name__ == "__main__":
+    unittest.main()